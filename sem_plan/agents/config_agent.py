@@ -3,6 +3,11 @@ from __future__ import annotations
 import yaml
 from typing import Any, Dict
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # pure-Python fallback when PyYAML lacks libyaml
+    from yaml import SafeLoader as _YamlLoader
+
 from ..core.types import Config, AdBudgets, ProjectSettings
 
 
@@ -15,10 +20,18 @@ def _require(condition: bool, message: str) -> None:
         raise ConfigValidationError(message)
 
 
+def load_yaml(stream: Any) -> Any:
+    """Parse YAML from a string, bytes or file with the fastest available safe loader."""
+    return yaml.load(stream, Loader=_YamlLoader)
+
+
 def load_and_validate_config(path: str) -> Config:
     with open(path, "r", encoding="utf-8") as f:
-        raw: Dict[str, Any] = yaml.safe_load(f) or {}
+        raw: Dict[str, Any] = load_yaml(f) or {}
+    return validate_config(raw)
+
 
+def validate_config(raw: Dict[str, Any]) -> Config:
     brand_url = raw.get("brand_url")
     competitor_urls = raw.get("competitor_urls") or []
     service_locations = raw.get("service_locations") or []
@@ -3,14 +3,16 @@ from __future__ import annotations
 import re
 from typing import Iterable, List, Set, Optional
 
+import numpy as np
+import pandas as pd
+
 from ..core.types import RawKeyword
 from ..llm import filter_keywords_with_llm
 
 
-def _normalize(s: str) -> str:
-    s = s.lower().strip()
-    s = re.sub(r"\s+", " ", s)
-    return s
+_COMPETITION_LEVELS = (None, "low", "medium", "high")
+_COMPETITION_CODES = {level: code for code, level in enumerate(_COMPETITION_LEVELS) if level}
+_MISSING_VOLUME = -1
 
 
 def _llm_filter_junk(keywords: List[str], *, context: Optional[str] = None) -> Set[str]:
@@ -27,41 +29,49 @@ def _llm_filter_junk(keywords: List[str], *, context: Optional[str] = None) -> S
 def consolidate_and_filter(
     raw: Iterable[RawKeyword], *, min_volume: int | None, llm_context: Optional[str] = None
 ) -> List[RawKeyword]:
-    by_norm: dict[str, RawKeyword] = {}
-    for rk in raw:
-        norm = _normalize(rk.keyword)
-        if not norm:
-            continue
-        if norm in by_norm:
-            existing = by_norm[norm]
-            if (rk.volume or 0) > (existing.volume or 0):
-                existing.volume = rk.volume
-            if rk.competition in {"low", "medium", "high"}:
-                existing.competition = rk.competition
-            continue
-        by_norm[norm] = RawKeyword(
-            keyword=norm,
-            source=rk.source,
-            seed=rk.seed,
-            volume=rk.volume,
-            competition=rk.competition,
-            origin_url=rk.origin_url,
-        )
-
-    unique_keywords = list(by_norm.values())
+    raw = list(raw)
+    if not raw:
+        return []
 
-    if min_volume is not None:
-        # Prefer GKP-enriched AMS when available
-        def ams(rk: RawKeyword) -> int:
-            if rk.gkp_avg_monthly_searches is not None:
-                return int(rk.gkp_avg_monthly_searches)
-            return int(rk.volume or 0)
+    # Work column-wise: one frame for the whole candidate list instead of per-object bookkeeping.
+    # Numeric fields use fixed-width columns: int32 volume (-1 = missing), uint8 competition code.
+    df = pd.DataFrame(
+        [(rk.keyword, rk.source, rk.seed, rk.origin_url) for rk in raw],
+        columns=["keyword", "source", "seed", "origin_url"],
+        dtype=object,
+    )
+    df["volume"] = np.fromiter(
+        (_MISSING_VOLUME if rk.volume is None else rk.volume for rk in raw), dtype=np.int32, count=len(raw)
+    )
+    df["competition"] = np.fromiter(
+        (_COMPETITION_CODES.get(rk.competition, 0) for rk in raw), dtype=np.uint8, count=len(raw)
+    )
 
-        unique_keywords = [rk for rk in unique_keywords if ams(rk) >= min_volume]
+    df["normalized"] = df["keyword"].str.lower().str.strip().str.replace(r"\s+", " ", regex=True)
+    df = df[df["normalized"] != ""]
 
-    keep_set = _llm_filter_junk([rk.keyword for rk in unique_keywords], context=llm_context)
-    filtered = [rk for rk in unique_keywords if rk.keyword in keep_set]
+    # First occurrence wins for identity fields; volume takes the group max,
+    # competition the last known level seen for that keyword
+    unique = df.drop_duplicates("normalized").set_index("normalized")
+    max_volume = df.groupby("normalized", sort=False)["volume"].max()
+    unique["volume"] = max_volume.where(max_volume > unique["volume"].clip(lower=0), unique["volume"])
+    known = df["competition"].where(df["competition"] > 0)
+    unique["competition"] = known.groupby(df["normalized"], sort=False).last().fillna(0).astype(np.uint8)
 
-    return filtered
+    if min_volume is not None:
+        unique = unique[unique["volume"].clip(lower=0) >= min_volume]
 
+    keep_set = _llm_filter_junk(unique.index.tolist(), context=llm_context)
+    unique = unique[unique.index.isin(keep_set)]
 
+    return [
+        RawKeyword(
+            keyword=norm,
+            source=row.source,
+            seed=row.seed,
+            volume=None if row.volume == _MISSING_VOLUME else int(row.volume),
+            competition=_COMPETITION_LEVELS[row.competition],
+            origin_url=row.origin_url,
+        )
+        for norm, row in zip(unique.index, unique.itertuples(index=False))
+    ]
@@ -8,7 +8,7 @@ from bs4 import BeautifulSoup
 import requests
 
 from ...core.types import RawKeyword, Config
-from ...utils.http import get, polite_delay
+from ...utils.http import get_many, polite_delay
 
 
 class SearchSuggestionsCollector:
@@ -23,22 +23,52 @@ class SearchSuggestionsCollector:
         keywords = []
         
         # Get seed terms
-        seeds = self._get_seed_terms(extra_seeds)
+        seeds = self._get_seed_terms(extra_seeds)[:max_serp_queries]
         
-        for seed in seeds[:max_serp_queries]:
+        # Prefetch the SERPs; starts stay spaced like the old sequential loop, only slow responses overlap
+        serp_pages = get_many(
+            [self._serp_url(seed) for seed in seeds],
+            headers={"Accept": "text/html"},
+            per_host=2,
+            min_interval=2.0,
+            jitter=1.0,
+            cacheable=lambda r: not self._is_blocked_page(r),
+        )
+        
+        for i, seed in enumerate(seeds):
+            response = serp_pages.get(self._serp_url(seed))
+            html = self._response_text(response)
+            if html is not None and self._is_blocked_page(response):
+                print(f"Google SERP blocked (CAPTCHA) for {seed}")
+                html = None
+            
+            if i:
+                polite_delay(1.0)  # space out the autocomplete requests too
+            
             # Google Autocomplete
             keywords.extend(self._get_google_autocomplete(seed))
             
             # Google Related Searches
-            keywords.extend(self._get_google_related_searches(seed))
+            keywords.extend(self._get_google_related_searches(seed, html))
             
             # People Also Ask
-            keywords.extend(self._get_people_also_ask(seed))
-            
-            polite_delay(2.0)  # Be respectful
+            keywords.extend(self._get_people_also_ask(seed, html))
             
         return keywords
     
+    @staticmethod
+    def _serp_url(seed: str) -> str:
+        return f"https://www.google.com/search?q={seed.replace(' ', '+')}&hl=en"
+    
+    @staticmethod
+    def _response_text(response) -> Optional[str]:
+        return response.text if response is not None else None
+    
+    @staticmethod
+    def _is_blocked_page(response) -> bool:
+        # Google's rate-limit interstitial can come back as a 200 that parses to nothing
+        return response.url.path.startswith("/sorry") or "unusual traffic from your computer network" in response.text
+    
     def _get_seed_terms(self, extra_seeds: Optional[Iterable[str]]) -> List[str]:
         """Get seed terms from brand, competitors, and extra seeds."""
         seeds = []
@@ -105,15 +135,14 @@ class SearchSuggestionsCollector:
         
         return keywords
     
-    def _get_google_related_searches(self, seed: str) -> List[RawKeyword]:
-        """Get Google Related Searches from SERP."""
+    def _get_google_related_searches(self, seed: str, html: Optional[str]) -> List[RawKeyword]:
+        """Get Google Related Searches from a fetched SERP."""
         keywords = []
+        if not html:
+            return keywords
         
         try:
-            url = f"https://www.google.com/search?q={seed.replace(' ', '+')}&hl=en"
-            response = get(url, headers={"Accept": "text/html"})
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = BeautifulSoup(html, 'html.parser')
             
             # Look for related searches
             for el in soup.select("a[aria-level] span, a[href*='search?q='] span"):
@@ -130,15 +159,14 @@ class SearchSuggestionsCollector:
         
         return keywords
     
-    def _get_people_also_ask(self, seed: str) -> List[RawKeyword]:
-        """Get People Also Ask questions from SERP."""
+    def _get_people_also_ask(self, seed: str, html: Optional[str]) -> List[RawKeyword]:
+        """Get People Also Ask questions from a fetched SERP."""
         keywords = []
+        if not html:
+            return keywords
         
         try:
-            url = f"https://www.google.com/search?q={seed.replace(' ', '+')}&hl=en"
-            response = get(url, headers={"Accept": "text/html"})
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = BeautifulSoup(html, 'html.parser')
             
             # Look for People Also Ask questions
             for el in soup.select("div[jsname] div:has(q), div:has(cite)"):
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from dataclasses import replace
 from typing import List, Dict, Set, Tuple
 from urllib.parse import urlparse
 
@@ -28,12 +29,13 @@ class ScoringEngine:
         
         for kw in keywords:
             score = self._calculate_keyword_score(kw, brand_terms)
-            kw.gkp_avg_monthly_searches = score.get('volume', 100)
-            kw.gkp_top_of_page_bid_low = score.get('cpc_low', 1.0)
-            kw.gkp_top_of_page_bid_high = score.get('cpc_high', 2.0)
-            kw.gkp_competition = score.get('competition', 'medium')
-            
-            scored_keywords.append(kw)
+            scored_keywords.append(replace(
+                kw,
+                gkp_avg_monthly_searches=score.get('volume', 100),
+                gkp_top_of_page_bid_low=score.get('cpc_low', 1.0),
+                gkp_top_of_page_bid_high=score.get('cpc_high', 2.0),
+                gkp_competition=score.get('competition', 'medium'),
+            ))
         
         # Sort by score
         scored_keywords.sort(key=lambda x: x.gkp_avg_monthly_searches or 0, reverse=True)
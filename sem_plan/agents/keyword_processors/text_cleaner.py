@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import re
+from dataclasses import replace
 from typing import List
 
 from ...core.types import RawKeyword
@@ -20,8 +21,7 @@ class TextCleaner:
             # Clean the keyword
             cleaned_text = self._clean_keyword_text(kw.keyword)
             if cleaned_text and len(cleaned_text.split()) <= 6:  # Max 6 words
-                kw.keyword = cleaned_text
-                cleaned.append(kw)
+                cleaned.append(replace(kw, keyword=cleaned_text))
         
         return cleaned
     
@@ -2,7 +2,12 @@ from __future__ import annotations
 
 import re
 from collections import defaultdict
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import ahocorasick
+except ImportError:  # regex fallback
+    ahocorasick = None
 
 from ..core.types import KeywordRecord, RawKeyword
 from ..llm import cluster_keywords_with_llm
@@ -44,23 +49,76 @@ def _qualitative_competition(rk: RawKeyword) -> str | None:
     return None
 
 
-def _cluster_heuristic(keywords: List[str], *, brand_terms: Optional[List[str]] = None, competitor_terms: Optional[List[str]] = None, locations: Optional[List[str]] = None) -> Dict[str, List[str]]:
+class TermMatcher:
+    """Brand/competitor/location vocabulary compiled once per config and matched in one pass per keyword.
+
+    Uses an Aho-Corasick automaton when pyahocorasick is installed, otherwise precompiled regexes.
+    """
+
+    def __init__(self, brand_terms: Optional[List[str]] = None, competitor_terms: Optional[List[str]] = None, locations: Optional[List[str]] = None):
+        self.competitor_terms = [t.lower() for t in competitor_terms or [] if t]
+        vocab = {
+            "brand": [t.lower() for t in brand_terms or [] if t],
+            "competitor": self.competitor_terms,
+            "location": [t.lower() for t in locations or [] if t],
+        }
+        # term -> {kind: first position of the term in that kind's list}
+        index: Dict[str, Dict[str, int]] = defaultdict(dict)
+        for kind, terms in vocab.items():
+            for order, term in enumerate(terms):
+                index[term].setdefault(kind, order)
+
+        self._automaton = None
+        self._patterns: Dict[str, re.Pattern] = {}
+        if not index:
+            return
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for term, kinds in index.items():
+                self._automaton.add_word(term, kinds)
+            self._automaton.make_automaton()
+        else:
+            self._index = index
+            for kind, terms in vocab.items():
+                if terms:
+                    # Lookahead so overlapping terms are all seen; alternation order keeps list priority
+                    self._patterns[kind] = re.compile("(?=(" + "|".join(re.escape(t) for t in terms) + "))")
+
+    def classify(self, keyword: str) -> Tuple[bool, Optional[str], bool]:
+        """Return (has brand term, first matching competitor term, has location)."""
+        low = keyword.lower()
+        found: Dict[str, int] = {}
+        if self._automaton is not None:
+            for _, kinds in self._automaton.iter(low):
+                for kind, order in kinds.items():
+                    if order < found.get(kind, order + 1):
+                        found[kind] = order
+        else:
+            for kind, pattern in self._patterns.items():
+                orders = [self._index[m.group(1)][kind] for m in pattern.finditer(low)]
+                if orders:
+                    found[kind] = min(orders)
+        competitor = self.competitor_terms[found["competitor"]] if "competitor" in found else None
+        return "brand" in found, competitor, "location" in found
+
+
+def _cluster_heuristic(keywords: List[str], *, brand_terms: Optional[List[str]] = None, competitor_terms: Optional[List[str]] = None, locations: Optional[List[str]] = None, matcher: Optional[TermMatcher] = None) -> Dict[str, List[str]]:
+    if matcher is None:
+        matcher = TermMatcher(brand_terms, competitor_terms, locations)
     clusters: Dict[str, List[str]] = defaultdict(list)
     for k in keywords:
         low = k.lower()
+        is_brand, competitor, is_location = matcher.classify(low)
         # brand
-        if brand_terms and any(bt in low for bt in brand_terms):
+        if is_brand:
             clusters["Brand Terms"].append(k)
             continue
-        # competitors
-        if competitor_terms and any(ct in low for ct in competitor_terms):
-            # Try to label by the matching competitor token
-            matched = next((ct for ct in competitor_terms if ct in low), None)
-            group = f"Competitor: {matched}" if matched else "Competitor Terms"
-            clusters[group].append(k)
+        # competitors, labelled by the matching competitor token
+        if competitor is not None:
+            clusters[f"Competitor: {competitor}"].append(k)
             continue
         # locations
-        if locations and any(loc.lower() in low for loc in locations):
+        if is_location:
             clusters["Location-based Queries"].append(k)
             continue
         # heuristics for categories
@@ -75,17 +133,17 @@ def _cluster_heuristic(keywords: List[str], *, brand_terms: Optional[List[str]]
     return clusters
 
 
-def _cluster_with_llm(keywords: List[str], *, context: Optional[str] = None, brand_terms: Optional[List[str]] = None, competitor_terms: Optional[List[str]] = None, locations: Optional[List[str]] = None) -> Dict[str, List[str]]:
+def _cluster_with_llm(keywords: List[str], *, context: Optional[str] = None, brand_terms: Optional[List[str]] = None, competitor_terms: Optional[List[str]] = None, locations: Optional[List[str]] = None, matcher: Optional[TermMatcher] = None) -> Dict[str, List[str]]:
     try:
         clusters = cluster_keywords_with_llm(keywords, context=context)
         if clusters:
             return {g: [k.lower() for k in ks] for g, ks in clusters.items()}
     except Exception:
         pass
-    return _cluster_heuristic(keywords, brand_terms=brand_terms, competitor_terms=competitor_terms, locations=locations)
+    return _cluster_heuristic(keywords, brand_terms=brand_terms, competitor_terms=competitor_terms, locations=locations, matcher=matcher)
 
 
-def structure_keywords(filtered: List[RawKeyword], *, llm_context: Optional[str] = None, brand_terms: Optional[List[str]] = None, competitor_terms: Optional[List[str]] = None, locations: Optional[List[str]] = None) -> List[KeywordRecord]:
+def structure_keywords(filtered: List[RawKeyword], *, llm_context: Optional[str] = None, brand_terms: Optional[List[str]] = None, competitor_terms: Optional[List[str]] = None, locations: Optional[List[str]] = None, matcher: Optional[TermMatcher] = None) -> List[KeywordRecord]:
     intents: Dict[str, str] = {}
     comp_map: Dict[str, str | None] = {}
     volume_map: Dict[str, int | None] = {}
@@ -94,7 +152,7 @@ def structure_keywords(filtered: List[RawKeyword], *, llm_context: Optional[str]
         comp_map[rk.keyword] = _qualitative_competition(rk)
         volume_map[rk.keyword] = rk.volume
 
-    clusters = _cluster_with_llm([rk.keyword for rk in filtered], context=llm_context, brand_terms=brand_terms, competitor_terms=competitor_terms, locations=locations)
+    clusters = _cluster_with_llm([rk.keyword for rk in filtered], context=llm_context, brand_terms=brand_terms, competitor_terms=competitor_terms, locations=locations, matcher=matcher)
 
     records: List[KeywordRecord] = []
     for cluster_name, kws in clusters.items():
@@ -123,7 +181,7 @@ def structure_keywords(filtered: List[RawKeyword], *, llm_context: Optional[str]
                 match_type=mt,
                 competition=comp_map.get(k),
                 volume=volume_map.get(k),
-                sources=[],
+                sources=(),
                 gkp_avg_monthly_searches=gkp_ams if 'gkp_ams' in locals() else None,
                 gkp_top_of_page_bid_low=gkp_low,
                 gkp_top_of_page_bid_high=gkp_high,
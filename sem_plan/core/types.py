@@ -1,23 +1,23 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Literal
+from typing import List, Dict, Optional, Literal, Tuple
 
 
-@dataclass
+@dataclass(slots=True)
 class AdBudgets:
     search_ads_budget: float
     shopping_ads_budget: float
     pmax_ads_budget: float
 
 
-@dataclass
+@dataclass(slots=True)
 class ProjectSettings:
     assumed_conversion_rate: float = 0.02
     min_search_volume_threshold: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Config:
     brand_url: str
     competitor_urls: List[str]
@@ -26,7 +26,7 @@ class Config:
     project_settings: ProjectSettings = field(default_factory=ProjectSettings)
 
 
-@dataclass
+@dataclass(slots=True)
 class GkpMetrics:
     avg_monthly_searches: Optional[int] = None
     top_of_page_bid_low: Optional[float] = None
@@ -34,7 +34,7 @@ class GkpMetrics:
     competition: Optional[Literal["low", "medium", "high"]] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class GoogleAdsCredentials:
     developer_token: str
     client_id: str
@@ -43,7 +43,7 @@ class GoogleAdsCredentials:
     login_customer_id: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RawKeyword:
     keyword: str
     source: Literal[
@@ -64,7 +64,7 @@ class RawKeyword:
     gkp_competition: Optional[Literal["low", "medium", "high"]] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class KeywordRecord:
     keyword: str
     normalized: str
@@ -73,14 +73,35 @@ class KeywordRecord:
     match_type: Literal["broad", "phrase", "exact"]
     competition: Optional[Literal["low", "medium", "high"]]
     volume: Optional[int]
-    sources: List[str]
+    sources: Tuple[str, ...]
     # Optional GKP enrichment carried to outputs
     gkp_avg_monthly_searches: Optional[int] = None
     gkp_top_of_page_bid_low: Optional[float] = None
     gkp_top_of_page_bid_high: Optional[float] = None
 
-
-@dataclass
+    def __post_init__(self) -> None:
+        # Accept any iterable but store a tuple so records stay hashable
+        object.__setattr__(self, "sources", tuple(self.sources))
+
+    @property
+    def numeric_volume(self) -> int:
+        """GKP volume, else heuristic volume, as an int (0 when missing or non-numeric)."""
+        v = self.gkp_avg_monthly_searches or self.volume
+        try:
+            return int(v) if v is not None else 0
+        except (ValueError, TypeError):
+            return 0
+
+    @property
+    def numeric_cpc_low(self) -> float:
+        """Low top-of-page bid as a float (0.0 when missing or non-numeric)."""
+        try:
+            return float(self.gkp_top_of_page_bid_low or 0.0)
+        except (ValueError, TypeError):
+            return 0.0
+
+
+@dataclass(slots=True)
 class CampaignOutputs:
     search_keywords: List[KeywordRecord]
     pmax_themes: List[str]
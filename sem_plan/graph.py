@@ -1,20 +1,37 @@
 from __future__ import annotations
 
-from typing import Iterable, Optional
+import itertools
+import re
+from typing import Any, Iterable, Optional
+from urllib.parse import urlparse
 
 from langgraph.graph import StateGraph, END
 from pydantic import BaseModel, Field
 
-from .agents.config_agent import load_and_validate_config
+from .agents.config_agent import load_and_validate_config, validate_config
 from .agents.keyword_agent import gather_keywords, enrich_keywords_with_heuristic_metrics
 from .agents.filter_agent import consolidate_and_filter
-from .agents.structure_agent import structure_keywords
+from .agents.structure_agent import TermMatcher, structure_keywords
 from .agents.strategy_agent import assemble_outputs, write_outputs_txt_csv
-from .core.types import CampaignOutputs
+from .core.types import CampaignOutputs, Config
+
+
+_STOP_TOKENS = frozenset({"www", "com", "net", "org", "io", "ai", "co"})
+_HOST_RE = re.compile(r"[^.]+")
+
+
+def _extract_tokens(url: str) -> list[str]:
+    try:
+        host = (urlparse(url).hostname or "").lower()
+    except ValueError:
+        return []
+    return [t for t in _HOST_RE.findall(host) if t not in _STOP_TOKENS]
 
 
 class PipelineState(BaseModel):
-    config_path: str
+    # config comes either from a YAML file or an already-parsed dict
+    config_path: Optional[str] = None
+    config_data: Optional[dict] = None
     outputs_dir: str
     max_serp_queries: int = 10
     extra_seeds: Optional[list[str]] = None
@@ -25,15 +42,30 @@ class PipelineState(BaseModel):
     filtered_keywords: list = Field(default_factory=list)
     structured_records: list = Field(default_factory=list)
     outputs: Optional[CampaignOutputs] = None
+    # compiled brand/competitor/location matcher, built once per config
+    term_matcher: Optional[Any] = Field(default=None, exclude=True)
+
+
+def _load_config(state: PipelineState) -> Config:
+    if state.config_data is not None:
+        return validate_config(state.config_data)
+    return load_and_validate_config(state.config_path)
+
+
+def _clustering_terms(cfg) -> tuple[list[str], list[str], list[str]]:
+    brand_terms = _extract_tokens(cfg.brand_url)
+    competitor_terms = list(itertools.chain.from_iterable(_extract_tokens(u) for u in cfg.competitor_urls))
+    return brand_terms, competitor_terms, cfg.service_locations
 
 
 def node_load_config(state: PipelineState) -> PipelineState:
-    load_and_validate_config(state.config_path)  # validation side-effect
+    cfg = _load_config(state)  # validation side-effect
+    state.term_matcher = TermMatcher(*_clustering_terms(cfg))
     return state
 
 
 def node_gather(state: PipelineState) -> PipelineState:
-    cfg = load_and_validate_config(state.config_path)
+    cfg = _load_config(state)
     state.raw_keywords = gather_keywords(
         cfg, extra_seeds=state.extra_seeds, max_serp_queries=state.max_serp_queries
     )
@@ -43,7 +75,7 @@ def node_gather(state: PipelineState) -> PipelineState:
 
 
 def node_filter(state: PipelineState) -> PipelineState:
-    cfg = load_and_validate_config(state.config_path)
+    cfg = _load_config(state)
     state.filtered_keywords = consolidate_and_filter(
         state.raw_keywords, min_volume=cfg.project_settings.min_search_volume_threshold, llm_context=state.llm_context
     )
@@ -52,24 +84,8 @@ def node_filter(state: PipelineState) -> PipelineState:
 
 def node_structure(state: PipelineState) -> PipelineState:
     # Build brand and competitor tokens and locations for clustering
-    cfg = load_and_validate_config(state.config_path)
-    from urllib.parse import urlparse
-
-    def extract_tokens(url: str) -> list[str]:
-        try:
-            host = urlparse(url).hostname or ""
-            host = host.lower()
-            parts = [p for p in host.split(".") if p not in {"www", "com", "net", "org", "io", "ai", "co"}]
-            return parts
-        except Exception:
-            return []
-
-    brand_terms = extract_tokens(cfg.brand_url)
-    competitor_terms = []
-    for u in cfg.competitor_urls:
-        competitor_terms.extend(extract_tokens(u))
-
-    locations = cfg.service_locations
+    cfg = _load_config(state)
+    brand_terms, competitor_terms, locations = _clustering_terms(cfg)
 
     state.structured_records = structure_keywords(
         state.filtered_keywords,
@@ -77,12 +93,13 @@ def node_structure(state: PipelineState) -> PipelineState:
         brand_terms=brand_terms,
         competitor_terms=competitor_terms,
         locations=locations,
+        matcher=state.term_matcher,
     )
     return state
 
 
 def node_strategy(state: PipelineState) -> PipelineState:
-    cfg = load_and_validate_config(state.config_path)
+    cfg = _load_config(state)
     state.outputs = assemble_outputs(cfg, state.structured_records)
     write_outputs_txt_csv(state.outputs_dir, state.outputs)
     return state
@@ -1,28 +1,25 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import os
-from typing import List, Dict, Optional
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple
 
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 from langchain_google_genai import ChatGoogleGenerativeAI
 
+try:
+    import orjson
+except ImportError:  # stdlib fallback
+    orjson = None
 
-def _get_model(model_name: str = "gemini-1.5-flash") -> ChatGoogleGenerativeAI | None:
-    api_key = os.getenv("GEMINI_API_KEY")
-    if not api_key:
-        return None
-    return ChatGoogleGenerativeAI(model=model_name, api_key=api_key, temperature=0)
+from .utils.cache import llm_cache_get, llm_cache_put, semantic_cache_insert, semantic_cache_lookup
 
 
-def filter_keywords_with_llm(candidates: List[str], *, context: Optional[str] = None) -> List[str]:
-    model = _get_model()
-    if model is None:
-        # Fallback: return as-is (heuristics are applied elsewhere)
-        return candidates
-
-    prompt = PromptTemplate.from_template(
-        """
+_FILTER_PROMPT = PromptTemplate.from_template(
+    """
 You are a marketing analyst. Use the following business context to decide relevance.
 Context:
 {context}
@@ -31,22 +28,11 @@ From the list below, return ONLY the keywords relevant to the business's offerin
 Output: one keyword per line, no bullets, no numbering.
 
 {keywords}
-        """
-    )
-
-    chain = prompt | model | StrOutputParser()
-    text = chain.invoke({"keywords": "\n".join(candidates), "context": context or ""})
-    kept = [line.strip() for line in text.splitlines() if line.strip()]
-    return kept
-
-
-def cluster_keywords_with_llm(candidates: List[str], *, context: Optional[str] = None) -> Dict[str, List[str]]:
-    model = _get_model()
-    if model is None:
-        return {}
+    """
+)
 
-    prompt = PromptTemplate.from_template(
-        """
+_CLUSTER_PROMPT = PromptTemplate.from_template(
+    """
 Cluster the following keywords into concise, semantically tight ad groups.
 Use this business context to inform grouping (brand, competitors, locations, and offerings):
 {context}
@@ -55,24 +41,176 @@ Prefer groups like Brand Terms, Competitor: X, Category: Y, Use Case: Z, Locatio
 Return JSON ONLY as a mapping from group name to list of keywords.
 
 {keywords}
-        """
-    )
+    """
+)
+
+_PARSER = StrOutputParser()
+
+
+def _get_model(model_name: str = "gemini-1.5-flash") -> ChatGoogleGenerativeAI | None:
+    api_key = os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        return None
+    return ChatGoogleGenerativeAI(model=model_name, api_key=api_key, temperature=0)
+
+
+def _min_llm_candidates() -> int:
+    # Lists shorter than this aren't worth a Gemini round-trip
+    return int(os.getenv("SEM_PLAN_LLM_MIN_CANDIDATES", "4"))
+
+
+def _semantic_cache_ttl() -> float:
+    # Seconds a semantic cache entry stays usable
+    return float(os.getenv("SEM_PLAN_SEMANTIC_CACHE_TTL", str(30 * 86400)))
+
+
+def _normalized_candidates(candidates: List[str]) -> List[str]:
+    return sorted({" ".join(c.lower().split()) for c in candidates})
+
+
+def _candidate_set_key(candidates: List[str], context: Optional[str]) -> str:
+    # Order- and whitespace-insensitive, so permuted seeds still hit the cache
+    payload = "\n".join(_normalized_candidates(candidates)) + "\x00" + (context or "")
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
-    chain = prompt | model | StrOutputParser()
+
+@lru_cache(maxsize=1)
+def _embedding_model():
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer("all-MiniLM-L6-v2")
+
+
+def _embed_candidate_set(candidates: List[str]) -> Optional[List[float]]:
+    # Mean of per-keyword embeddings, so long lists aren't cut off at the model's token limit
+    try:
+        vectors = _embedding_model().encode(_normalized_candidates(candidates), normalize_embeddings=True)
+        centroid = vectors.mean(axis=0)
+        norm = float((centroid ** 2).sum() ** 0.5)
+        return (centroid / norm).tolist() if norm > 0 else None
+    except Exception:
+        return None
+
+
+def _semantic_namespace(kind: str, context: Optional[str]) -> str:
+    # Separate filter/cluster results and never reuse an answer given for a different business context.
+    # v2 entries also record the candidate set they answered for.
+    return f"{kind}:v2:{hashlib.sha256((context or '').encode('utf-8')).hexdigest()[:16]}"
+
+
+def _split_by_coverage(candidates: List[str], covered: List[str]) -> Tuple[Dict[str, str], List[str]]:
+    """Map normalized form -> current spelling for candidates a cached entry answered for, and list the rest.
+
+    A semantic hit only means the sets are close, so cached answers are reconciled against the
+    current candidates rather than returned verbatim.
+    """
+    covered_set = set(covered)
+    known: Dict[str, str] = {}
+    uncovered: List[str] = []
+    for c in candidates:
+        norm = " ".join(c.lower().split())
+        if norm in covered_set:
+            known.setdefault(norm, c)
+        else:
+            uncovered.append(c)
+    return known, uncovered
+
+
+def _filter_live(model: ChatGoogleGenerativeAI, candidates: List[str], context: Optional[str]) -> List[str]:
+    chain = _FILTER_PROMPT | model | _PARSER
+    text = chain.invoke({"keywords": "\n".join(candidates), "context": context or ""})
+    return [line.strip() for line in text.splitlines() if line.strip()]
+
+
+def filter_keywords_with_llm(candidates: List[str], *, context: Optional[str] = None) -> List[str]:
+    if len(candidates) < _min_llm_candidates():
+        return list(candidates)
+
+    key = _candidate_set_key(candidates, context)
+    cached = llm_cache_get(key)
+    if cached is not None:
+        return list(cached)
+
+    model = _get_model()
+    if model is None:
+        # Fallback: return as-is (heuristics are applied elsewhere)
+        return candidates
+
+    namespace = _semantic_namespace("filter", context)
+    vector = _embed_candidate_set(candidates)
+    if vector is not None:
+        similar = semantic_cache_lookup(namespace, vector, ttl=_semantic_cache_ttl())
+        if similar is not None:
+            known, uncovered = _split_by_coverage(candidates, similar["candidates"])
+            kept_norm = {" ".join(k.lower().split()) for k in similar["kept"]}
+            kept = [c for norm, c in known.items() if norm in kept_norm]
+            # Candidates the cached entry never saw get a live verdict; too few to bother are kept
+            if len(uncovered) >= _min_llm_candidates():
+                kept.extend(_filter_live(model, uncovered, context))
+            else:
+                kept.extend(uncovered)
+            return kept
+
+    kept = _filter_live(model, candidates, context)
+    llm_cache_put(key, kept)
+    if vector is not None:
+        semantic_cache_insert(
+            namespace, vector, {"candidates": _normalized_candidates(candidates), "kept": kept}, ttl=_semantic_cache_ttl()
+        )
+    return kept
+
+
+def _cluster_live(model: ChatGoogleGenerativeAI, candidates: List[str], context: Optional[str]) -> Dict[str, List[str]]:
+    chain = _CLUSTER_PROMPT | model | _PARSER
     text = chain.invoke({"keywords": "\n".join(candidates), "context": context or ""})
-    import json
 
-    start = text.find("{")
-    end = text.rfind("}")
-    block = text[start : end + 1] if start != -1 and end != -1 else "{}"
+    raw = text.encode("utf-8")
+    start = raw.find(b"{")
+    end = raw.rfind(b"}")
+    if start == -1 or end == -1:
+        return {}
+    block = memoryview(raw)[start : end + 1]
     try:
-        data = json.loads(block)
+        data = orjson.loads(block) if orjson is not None else json.loads(bytes(block))
         out: Dict[str, List[str]] = {}
         for k, v in data.items():
             if isinstance(v, list):
                 out[str(k)] = [str(x) for x in v]
-        return out
     except Exception:
         return {}
+    return out
+
 
+def cluster_keywords_with_llm(candidates: List[str], *, context: Optional[str] = None) -> Dict[str, List[str]]:
+    if len(candidates) < _min_llm_candidates():
+        # Empty result lets callers fall back to heuristic clustering
+        return {}
+
+    model = _get_model()
+    if model is None:
+        return {}
 
+    namespace = _semantic_namespace("cluster", context)
+    vector = _embed_candidate_set(candidates)
+    if vector is not None:
+        similar = semantic_cache_lookup(namespace, vector, ttl=_semantic_cache_ttl())
+        if similar is not None:
+            known, uncovered = _split_by_coverage(candidates, similar["candidates"])
+            out: Dict[str, List[str]] = {}
+            for group, members in similar["clusters"].items():
+                current = [known[n] for n in (" ".join(str(m).lower().split()) for m in members) if n in known]
+                if current:
+                    out[str(group)] = current
+            extra = _cluster_live(model, uncovered, context) if len(uncovered) >= _min_llm_candidates() else {}
+            if uncovered and not extra:
+                extra = {"Category: General": uncovered}
+            for group, members in extra.items():
+                out.setdefault(group, []).extend(members)
+            return out
+
+    out = _cluster_live(model, candidates, context)
+    if out and vector is not None:
+        semantic_cache_insert(
+            namespace, vector, {"candidates": _normalized_candidates(candidates), "clusters": out}, ttl=_semantic_cache_ttl()
+        )
+    return out
@@ -1,28 +1,51 @@
 from __future__ import annotations
 
-from typing import Iterable, Optional
+from typing import Any, Callable, Dict, Iterable, Optional
 
 from .core.types import CampaignOutputs
 from .graph import build_graph, PipelineState
 
 
+# Reported as each graph node finishes: (stage now running, percent complete)
+_NODE_PROGRESS = {
+    "validate_config": ("Collecting keywords from multiple sources", 10),
+    "gather": ("Filtering keywords", 50),
+    "filter": ("Clustering keywords into ad groups", 65),
+    "structure": ("Creating campaign outputs", 85),
+    "strategy": ("Analysis complete", 100),
+}
+
+
 def run_pipeline(
     *,
-    config_path: str,
+    config_path: Optional[str] = None,
+    config: Optional[Dict[str, Any]] = None,
     outputs_dir: str,
     max_serp_queries: int = 10,
     extra_seeds: Optional[Iterable[str]] = None,
     llm_context: Optional[str] = None,
+    progress_callback: Optional[Callable[[str, int], None]] = None,
 ) -> CampaignOutputs:
+    """Run the planning graph on a YAML config file or an in-memory config dict."""
+    if config is None and config_path is None:
+        raise ValueError("run_pipeline needs either config_path or config")
     graph = build_graph().compile()
     state = PipelineState(
         config_path=config_path,
+        config_data=config,
         outputs_dir=outputs_dir,
         max_serp_queries=max_serp_queries,
         extra_seeds=list(extra_seeds) if extra_seeds else None,
         llm_context=llm_context,
     )
-    final_state = graph.invoke(state)
+    final_state = None
+    for mode, chunk in graph.stream(state, stream_mode=["updates", "values"]):
+        if mode == "values":
+            final_state = chunk
+        elif progress_callback is not None:
+            for node in chunk:
+                if node in _NODE_PROGRESS:
+                    progress_callback(*_NODE_PROGRESS[node])
     # LangGraph may return a dict-like state; support both
     if isinstance(final_state, dict):
         outputs = final_state.get("outputs")
@@ -1,16 +1,30 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import List, Optional, Literal
+import os
+import sys
+import warnings
 
-# Backward-compat shim: re-export from core.types for direct imports
-from .core.types import (
-    AdBudgets,
-    ProjectSettings,
-    Config,
-    RawKeyword,
-    KeywordRecord,
-    CampaignOutputs,
-)
+# Backward-compat shim: alias this module to core.types for direct imports
+from .core import types as _core_types
 
 
+def _importer_stacklevel() -> int:
+    """Stack level that points the warning at the line importing this module.
+
+    warnings already skips the frozen importlib bootstrap frames, but not importlib's
+    Python-level wrappers such as import_module, so those are counted here.
+    """
+    level = 2
+    frame = sys._getframe(2)  # the first frame above this module's body
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if not filename.startswith("<frozen importlib"):
+            if "importlib" + os.sep not in filename:
+                break
+            level += 1
+        frame = frame.f_back
+    return level
+
+
+warnings.warn("sem_plan.types is deprecated; use sem_plan.core.types", DeprecationWarning, stacklevel=_importer_stacklevel())
+sys.modules[__name__] = _core_types
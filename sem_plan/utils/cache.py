@@ -1,8 +1,18 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import os
-from typing import Any, Dict, Optional
+import pickle
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # stdlib fallback
+    orjson = None
 
 
 def _default_cache_path() -> str:
@@ -11,13 +21,34 @@ def _default_cache_path() -> str:
     return os.path.join(base, "metrics.json")
 
 
+def _llm_cache_path() -> str:
+    return os.path.join(os.path.dirname(_default_cache_path()), "llm_filter.json")
+
+
+def _semantic_cache_path() -> str:
+    return os.path.join(os.path.dirname(_default_cache_path()), "llm_semantic.json")
+
+
+def _http_cache_base(url: str) -> str:
+    base = os.path.join(os.path.dirname(_default_cache_path()), "http")
+    os.makedirs(base, exist_ok=True)
+    return os.path.join(base, hashlib.sha256(url.encode("utf-8")).hexdigest())
+
+
+def _pipeline_cache_path(key: str) -> str:
+    base = os.path.join(os.path.dirname(_default_cache_path()), "pipeline")
+    os.makedirs(base, exist_ok=True)
+    return os.path.join(base, key + ".pkl")
+
+
 def load_cache(path: Optional[str] = None) -> Dict[str, Any]:
     cache_path = path or _default_cache_path()
     if not os.path.exists(cache_path):
         return {}
     try:
-        with open(cache_path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(cache_path, "rb") as f:
+            raw = f.read()
+        return orjson.loads(raw) if orjson is not None else json.loads(raw)
     except Exception:
         return {}
 
@@ -25,7 +56,122 @@ def load_cache(path: Optional[str] = None) -> Dict[str, Any]:
 def save_cache(data: Dict[str, Any], path: Optional[str] = None) -> None:
     cache_path = path or _default_cache_path()
     os.makedirs(os.path.dirname(cache_path), exist_ok=True)
-    with open(cache_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    if orjson is not None:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+    # Write to a sibling temp file and swap it in, so a crash never leaves a truncated cache
+    tmp_path = cache_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(payload)
+    os.replace(tmp_path, cache_path)
+
+
+def llm_cache_get(key: str, path: Optional[str] = None) -> Optional[Any]:
+    return load_cache(path or _llm_cache_path()).get(key)
+
+
+def llm_cache_put(key: str, value: Any, path: Optional[str] = None) -> None:
+    cache_path = path or _llm_cache_path()
+    data = load_cache(cache_path)
+    data[key] = value
+    save_cache(data, cache_path)
+
+
+def _live_semantic_entries(entries: List[Dict[str, Any]], ttl: float) -> List[Dict[str, Any]]:
+    cutoff = time.time() - ttl
+    return [e for e in entries if float(e.get("stored_at", 0)) >= cutoff]
+
+
+def semantic_cache_lookup(
+    namespace: str,
+    vector: List[float],
+    threshold: float = 0.95,
+    path: Optional[str] = None,
+    ttl: float = 30 * 86400,
+) -> Optional[Any]:
+    """Return the result stored under the nearest vector if its cosine similarity reaches `threshold`.
+
+    Vectors are expected to be unit-normalized, so the dot product is the cosine similarity.
+    Entries older than `ttl` seconds are ignored.
+    """
+    entries = _live_semantic_entries(load_cache(path or _semantic_cache_path()).get(namespace) or [], ttl)
+    if not entries:
+        return None
+    matrix = np.asarray([e["vector"] for e in entries], dtype=np.float32)
+    scores = matrix @ np.asarray(vector, dtype=np.float32)
+    best = int(np.argmax(scores))
+    return entries[best]["result"] if scores[best] >= threshold else None
+
+
+def semantic_cache_insert(
+    namespace: str,
+    vector: List[float],
+    result: Any,
+    path: Optional[str] = None,
+    ttl: float = 30 * 86400,
+    max_entries: int = 256,
+) -> None:
+    """Store `result` under `vector`, dropping expired entries and keeping the newest `max_entries` per namespace."""
+    cache_path = path or _semantic_cache_path()
+    # Expire across every namespace, so contexts that are no longer used don't grow the file forever
+    data = {ns: live for ns, entries in load_cache(cache_path).items() if (live := _live_semantic_entries(entries, ttl))}
+    entries = data.setdefault(namespace, [])
+    entries.append({"vector": [float(x) for x in vector], "result": result, "stored_at": time.time()})
+    data[namespace] = entries[-max_entries:]
+    save_cache(data, cache_path)
+
+
+# Headers that describe the wire encoding; the stored body is already decoded
+_HTTP_SKIP_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+def http_cache_get(url: str, ttl: float) -> Optional[Tuple[int, Dict[str, str], bytes, str]]:
+    """Return (status, headers, body, final URL after redirects) for a fresh cached GET of `url`."""
+    base = _http_cache_base(url)
+    meta = load_cache(base + ".json")
+    if not meta or time.time() - float(meta.get("fetched_at", 0)) > ttl:
+        return None
+    try:
+        with open(base + ".bin", "rb") as f:
+            body = f.read()
+    except OSError:
+        return None
+    return int(meta["status"]), dict(meta.get("headers") or {}), body, str(meta.get("final_url") or url)
+
+
+def http_cache_put(url: str, status: int, headers: Dict[str, str], body: bytes, final_url: Optional[str] = None) -> None:
+    base = _http_cache_base(url)
+    # Body first, metadata last: a metadata file always points at a complete body
+    with open(base + ".bin.tmp", "wb") as f:
+        f.write(body)
+    os.replace(base + ".bin.tmp", base + ".bin")
+    save_cache(
+        {
+            "url": url,
+            "final_url": final_url or url,
+            "status": status,
+            "headers": {k: v for k, v in headers.items() if k.lower() not in _HTTP_SKIP_HEADERS},
+            "fetched_at": time.time(),
+        },
+        base + ".json",
+    )
+
+
+def pipeline_cache_get(key: str, ttl: float) -> Optional[Any]:
+    """Return the pickled pipeline result stored under `key` if it is younger than `ttl` seconds."""
+    path = _pipeline_cache_path(key)
+    try:
+        if time.time() - os.path.getmtime(path) > ttl:
+            return None
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except Exception:
+        return None
 
 
+def pipeline_cache_put(key: str, value: Any) -> None:
+    path = _pipeline_cache_path(key)
+    with open(path + ".tmp", "wb") as f:
+        pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(path + ".tmp", path)
@@ -1,10 +1,18 @@
 from __future__ import annotations
 
+import asyncio
+import os
+import random
 import time
-from typing import Optional
+from typing import Callable, Dict, Iterable, Optional
+from urllib.parse import urlparse
 
+import httpx
 import requests
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from requests.adapters import HTTPAdapter
+from tenacity import AsyncRetrying, retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+
+from .cache import http_cache_get, http_cache_put
 
 
 DEFAULT_HEADERS = {
@@ -16,6 +24,14 @@ DEFAULT_HEADERS = {
 }
 
 
+# One keep-alive session for the whole process so repeated fetches reuse TCP/TLS connections
+_session = requests.Session()
+_session.headers.update(DEFAULT_HEADERS)
+_adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=0)
+_session.mount("https://", _adapter)
+_session.mount("http://", _adapter)
+
+
 class HttpError(Exception):
     pass
 
@@ -24,20 +40,154 @@ def polite_delay(seconds: float = 1.0) -> None:
     time.sleep(seconds)
 
 
+def _http_cache_ttl() -> float:
+    # Seconds a cached GET stays fresh; 0 disables the disk cache
+    return float(os.getenv("SEM_PLAN_HTTP_CACHE_TTL", "86400"))
+
+
+def _cached_response(url: str, status: int, headers: dict, body: bytes, final_url: str) -> requests.Response:
+    resp = requests.Response()
+    resp.url = final_url
+    resp.status_code = status
+    resp.headers.update(headers)
+    resp._content = body
+    resp.encoding = requests.utils.get_encoding_from_headers(resp.headers)
+    return resp
+
+
 @retry(
     reraise=True,
     stop=stop_after_attempt(3),
     wait=wait_exponential(multiplier=0.5, min=0.5, max=4),
     retry=retry_if_exception_type(HttpError),
 )
-def get(url: str, *, timeout: float = 20.0, headers: Optional[dict] = None) -> requests.Response:
-    h = {**DEFAULT_HEADERS, **(headers or {})}
+def get(
+    url: str,
+    *,
+    timeout: float = 20.0,
+    headers: Optional[dict] = None,
+    no_cache: bool = False,
+    cacheable: Optional[Callable[[requests.Response], bool]] = None,
+) -> requests.Response:
+    """GET with retries and the disk cache; `cacheable` can veto storing a successful response."""
+    ttl = _http_cache_ttl()
+    use_cache = not no_cache and ttl > 0
+    if use_cache:
+        hit = http_cache_get(url, ttl)
+        if hit is not None:
+            return _cached_response(url, *hit)
     try:
-        resp = requests.get(url, headers=h, timeout=timeout)
+        resp = _session.get(url, headers=headers, timeout=timeout)
     except requests.RequestException as exc:
         raise HttpError(str(exc))
     if resp.status_code >= 400:
         raise HttpError(f"GET {url} failed: {resp.status_code}")
+    if use_cache and (cacheable is None or cacheable(resp)):
+        http_cache_put(url, resp.status_code, dict(resp.headers), resp.content, resp.url)
+    return resp
+
+
+class _HostPacer:
+    """Spaces request starts to one host at least `interval` seconds apart, plus up to `jitter` seconds."""
+
+    def __init__(self, interval: float, jitter: float = 0.0) -> None:
+        self.interval = interval
+        self.jitter = jitter
+        self._lock = asyncio.Lock()
+        self._next_start = 0.0
+
+    async def wait(self) -> None:
+        async with self._lock:
+            now = asyncio.get_running_loop().time()
+            start = max(now, self._next_start)
+            self._next_start = start + self.interval + random.uniform(0.0, self.jitter)
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+async def aget(
+    url: str,
+    *,
+    client: httpx.AsyncClient,
+    sem: asyncio.Semaphore,
+    timeout: float = 20.0,
+    headers: Optional[dict] = None,
+    pacer: Optional[_HostPacer] = None,
+) -> httpx.Response:
+    async for attempt in AsyncRetrying(
+        reraise=True,
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=0.5, min=0.5, max=4),
+        retry=retry_if_exception_type(HttpError),
+    ):
+        with attempt:
+            async with sem:
+                if pacer is not None:
+                    await pacer.wait()
+                try:
+                    resp = await client.get(url, headers={**DEFAULT_HEADERS, **(headers or {})}, timeout=timeout)
+                except httpx.HTTPError as exc:
+                    raise HttpError(str(exc))
+            if resp.status_code >= 400:
+                raise HttpError(f"GET {url} failed: {resp.status_code}")
     return resp
 
 
+def get_many(
+    urls: Iterable[str],
+    *,
+    timeout: float = 20.0,
+    headers: Optional[dict] = None,
+    per_host: int = 4,
+    min_interval: float = 0.0,
+    jitter: float = 0.0,
+    no_cache: bool = False,
+    cacheable: Optional[Callable[[httpx.Response], bool]] = None,
+) -> Dict[str, Optional[httpx.Response]]:
+    """Fetch URLs concurrently, at most `per_host` in flight per host; failed fetches map to None.
+
+    With `min_interval` set, requests to the same host (retries included) start at least that many
+    seconds apart, plus up to `jitter` seconds of random delay. Responses for which `cacheable`
+    returns False (e.g. rate-limit pages served with a 200) are returned but not stored on disk.
+    """
+    ttl = _http_cache_ttl()
+    use_cache = not no_cache and ttl > 0
+    out: Dict[str, Optional[httpx.Response]] = {}
+    misses = []
+    for u in dict.fromkeys(urls):
+        hit = http_cache_get(u, ttl) if use_cache else None
+        if hit is None:
+            misses.append(u)
+            continue
+        status, cached_headers, body, final_url = hit
+        out[u] = httpx.Response(status, headers=cached_headers, content=body, request=httpx.Request("GET", final_url))
+
+    async def _run() -> Dict[str, Optional[httpx.Response]]:
+        # Semaphores must be created inside the running loop
+        hosts = {urlparse(u).hostname for u in misses}
+        sems = {host: asyncio.Semaphore(per_host) for host in hosts}
+        pacers = {host: _HostPacer(min_interval, jitter) for host in hosts} if min_interval > 0 or jitter > 0 else {}
+        async with httpx.AsyncClient(follow_redirects=True) as client:
+            results = await asyncio.gather(
+                *(
+                    aget(u, client=client, sem=sems[host], timeout=timeout, headers=headers, pacer=pacers.get(host))
+                    for u, host in ((u, urlparse(u).hostname) for u in misses)
+                ),
+                return_exceptions=True,
+            )
+        fetched: Dict[str, Optional[httpx.Response]] = {}
+        for u, r in zip(misses, results):
+            if isinstance(r, BaseException):
+                print(f"GET {u} failed: {r}")
+                r = None
+            fetched[u] = r
+        return fetched
+
+    if misses:
+        fetched = asyncio.run(_run())
+        if use_cache:
+            for u, resp in fetched.items():
+                if resp is not None and (cacheable is None or cacheable(resp)):
+                    http_cache_put(u, resp.status_code, dict(resp.headers), resp.content, str(resp.url))
+        out.update(fetched)
+    return out
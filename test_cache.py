@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Test script for the on-disk caches.
+"""
+
+import sys
+import os
+import tempfile
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sem_plan.core.types import KeywordRecord, CampaignOutputs
+from sem_plan.utils.cache import (
+    load_cache,
+    pipeline_cache_get,
+    pipeline_cache_put,
+    semantic_cache_insert,
+    semantic_cache_lookup,
+)
+from sem_plan import llm
+
+
+def test_pipeline_cache_round_trip():
+    """Stored pipeline results come back until the TTL runs out."""
+
+    print("🧪 Testing pipeline cache...")
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)  # cache paths are relative to the working directory
+        try:
+            outputs = CampaignOutputs(
+                search_keywords=[
+                    KeywordRecord(
+                        keyword="budget planning tools",
+                        normalized="budget planning tools",
+                        intent="commercial",
+                        cluster="budget_planning",
+                        match_type="phrase",
+                        competition="low",
+                        volume=800,
+                        sources=("website_scraper",),
+                    )
+                ],
+                pmax_themes=[],
+                shopping_target_cpc=1.25,
+            )
+            assert pipeline_cache_get("missing", ttl=60) is None
+
+            pipeline_cache_put("abc", outputs)
+            cached = pipeline_cache_get("abc", ttl=60)
+            assert cached is not None
+            assert [k.keyword for k in cached.search_keywords] == ["budget planning tools"]
+            assert cached.shopping_target_cpc == 1.25
+
+            # Age the entry past its TTL
+            path = os.path.join(tmp, ".cache", "pipeline", "abc.pkl")
+            old = os.path.getmtime(path) - 120
+            os.utime(path, (old, old))
+            assert pipeline_cache_get("abc", ttl=60) is None
+            assert pipeline_cache_get("abc", ttl=600) is not None
+        finally:
+            os.chdir(cwd)
+
+    print("✅ Pipeline cache round-trip passed!")
+    return True
+
+
+def test_semantic_cache_reconciles_candidate_sets():
+    """A semantic hit for an overlapping set keeps only current candidates and sends new ones live."""
+
+    print("🧪 Testing semantic cache reconciliation...")
+
+    live_calls = []
+
+    def fake_filter_live(model, candidates, context):
+        live_calls.append(list(candidates))
+        return [c for c in candidates if "free" not in c]
+
+    def fake_cluster_live(model, candidates, context):
+        live_calls.append(list(candidates))
+        return {"Category: Software": list(candidates)}
+
+    patched = {
+        "_get_model": lambda: object(),
+        "_embed_candidate_set": lambda candidates: [1.0, 0.0],  # every set looks identical
+        "_filter_live": fake_filter_live,
+        "_cluster_live": fake_cluster_live,
+    }
+    originals = {name: getattr(llm, name) for name in patched}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        for name, fn in patched.items():
+            setattr(llm, name, fn)
+        try:
+            first = ["budget app", "budget planner", "free budget app", "expense tracker"]
+            assert llm.filter_keywords_with_llm(first) == ["budget app", "budget planner", "expense tracker"]
+            llm.cluster_keywords_with_llm(first)
+            live_calls.clear()
+
+            # Drops two cached keywords, adds four the cached entry never saw
+            second = ["Budget App", "expense tracker", "free savings app", "savings planner", "money app", "bill tracker"]
+            kept = llm.filter_keywords_with_llm(second)
+            assert kept == ["Budget App", "expense tracker", "savings planner", "money app", "bill tracker"]
+            assert live_calls == [["free savings app", "savings planner", "money app", "bill tracker"]]
+
+            clusters = llm.cluster_keywords_with_llm(second)
+            members = sorted(k for ks in clusters.values() for k in ks)
+            assert members == sorted(second)
+
+            # Too few unseen candidates for a live call: they are kept as-is
+            live_calls.clear()
+            third = ["budget app", "budget planner", "expense tracker", "debt tracker"]
+            assert llm.filter_keywords_with_llm(third) == third
+            assert live_calls == []
+        finally:
+            for name, fn in originals.items():
+                setattr(llm, name, fn)
+            os.chdir(cwd)
+
+    print("✅ Semantic cache reconciliation passed!")
+    return True
+
+
+def test_semantic_cache_expiry_and_cap():
+    """Semantic entries expire after the TTL and each namespace keeps only the newest ones."""
+
+    print("🧪 Testing semantic cache expiry and size cap...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "semantic.json")
+        for i in range(5):
+            semantic_cache_insert("ns", [1.0, 0.0], i, path=path, max_entries=3)
+        # Only the newest three survive
+        assert [e["result"] for e in load_cache(path)["ns"]] == [2, 3, 4]
+        assert semantic_cache_lookup("ns", [1.0, 0.0], path=path) is not None
+
+        # With a zero TTL everything already stored is expired
+        assert semantic_cache_lookup("ns", [1.0, 0.0], path=path, ttl=0) is None
+        semantic_cache_insert("other", [0.0, 1.0], "x", path=path, ttl=0)
+        assert list(load_cache(path)) == ["other"]
+
+    print("✅ Semantic cache expiry and size cap passed!")
+    return True
+
+
+if __name__ == "__main__":
+    success = (
+        test_pipeline_cache_round_trip()
+        and test_semantic_cache_reconciles_candidate_sets()
+        and test_semantic_cache_expiry_and_cap()
+    )
+    sys.exit(0 if success else 1)
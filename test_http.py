@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test script for the concurrent HTTP fetch helper.
+"""
+
+import sys
+import os
+import socket
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sem_plan.utils.http import get_many
+
+
+class _Handler(BaseHTTPRequestHandler):
+    arrivals = []
+
+    def do_GET(self):
+        _Handler.arrivals.append((self.path, time.monotonic()))
+        if self.path.startswith("/fail"):
+            self.send_response(500)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.end_headers()
+        self.wfile.write(self.path.encode("utf-8"))
+
+    def log_message(self, *args):
+        pass
+
+
+def _closed_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def test_get_many_pacing_and_failures():
+    """Requests to one host start at least `min_interval` apart; failed fetches map to None."""
+
+    print("🧪 Testing get_many...")
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)  # keep the HTTP disk cache out of the project tree
+        try:
+            urls = [f"{base}/page{i}" for i in range(4)]
+            out = get_many(urls, per_host=4, min_interval=0.2, no_cache=True)
+            assert [out[u].text for u in urls] == [f"/page{i}" for i in range(4)]
+            starts = sorted(t for path, t in _Handler.arrivals if path.startswith("/page"))
+            gaps = [b - a for a, b in zip(starts, starts[1:])]
+            assert all(gap >= 0.18 for gap in gaps), gaps
+
+            dead = f"http://127.0.0.1:{_closed_port()}/"
+            out = get_many([f"{base}/fail", dead, f"{base}/ok"], no_cache=True)
+            assert out[f"{base}/fail"] is None
+            assert out[dead] is None
+            assert out[f"{base}/ok"].text == "/ok"
+        finally:
+            os.chdir(cwd)
+            server.shutdown()
+
+    print("✅ get_many passed!")
+    return True
+
+
+if __name__ == "__main__":
+    success = test_get_many_pacing_and_failures()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test script for keyword consolidation and term matching.
+"""
+
+import sys
+import os
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sem_plan.core.types import RawKeyword
+from sem_plan.agents import filter_agent, structure_agent
+from sem_plan.agents.filter_agent import consolidate_and_filter
+from sem_plan.agents.structure_agent import TermMatcher
+
+
+def test_consolidate_merge_precedence():
+    """Duplicates merge on the normalized keyword: max volume, last known competition, first identity fields."""
+
+    print("🧪 Testing keyword consolidation...")
+
+    raw = [
+        RawKeyword(keyword="CRM  Software", source="brand_tool", seed="crm", volume=100, competition="low", origin_url="https://a.example"),
+        RawKeyword(keyword="crm software", source="serp_related", seed="other", volume=900, competition="high"),
+        RawKeyword(keyword=" crm software ", source="serp_paa", volume=None, competition=None),
+        RawKeyword(keyword="sales pipeline tool", source="competitor_tool", volume=None, competition="medium"),
+        RawKeyword(keyword="sales pipeline tool", source="serp_related", volume=None, competition=None),
+        RawKeyword(keyword="tiny niche term", source="seed_extra", volume=5, competition="low"),
+        RawKeyword(keyword="   ", source="seed_extra", volume=10_000),
+    ]
+
+    original = filter_agent.filter_keywords_with_llm
+    filter_agent.filter_keywords_with_llm = lambda keywords, context=None: list(keywords)
+    try:
+        merged = {rk.keyword: rk for rk in consolidate_and_filter(raw, min_volume=None)}
+        assert list(merged) == ["crm software", "sales pipeline tool", "tiny niche term"]
+
+        crm = merged["crm software"]
+        assert crm.volume == 900  # group max
+        assert crm.competition == "high"  # last known level; the trailing None does not reset it
+        assert (crm.source, crm.seed, crm.origin_url) == ("brand_tool", "crm", "https://a.example")  # first occurrence
+
+        pipeline = merged["sales pipeline tool"]
+        assert pipeline.volume is None
+        assert pipeline.competition == "medium"
+
+        # Missing volume counts as 0 against the threshold
+        kept = [rk.keyword for rk in consolidate_and_filter(raw, min_volume=50)]
+        assert kept == ["crm software"]
+    finally:
+        filter_agent.filter_keywords_with_llm = original
+
+    print("✅ Keyword consolidation passed!")
+    return True
+
+
+def _reference_classify(keyword, brand_terms, competitor_terms, locations):
+    low = keyword.lower()
+    is_brand = any(t.lower() in low for t in brand_terms)
+    competitor = next((t.lower() for t in competitor_terms if t.lower() in low), None)
+    is_location = any(t.lower() in low for t in locations)
+    return is_brand, competitor, is_location
+
+
+def test_term_matcher_paths_agree():
+    """The regex fallback and the Aho-Corasick path classify keywords the same way."""
+
+    print("🧪 Testing term matcher...")
+
+    brand = ["Acme", "acme crm"]
+    competitors = ["salesforce", "sales", "hubspot"]
+    locations = ["New York", "york", "London"]
+    keywords = [
+        "acme crm pricing",
+        "salesforce vs hubspot",
+        "hubspot salesforce alternative",
+        "sales tools new york",
+        "crm london",
+        "best crm",
+        "",
+    ]
+
+    original = structure_agent.ahocorasick
+    try:
+        structure_agent.ahocorasick = None
+        regex_matcher = TermMatcher(brand, competitors, locations)
+        assert regex_matcher._automaton is None
+        results = {"regex": [regex_matcher.classify(k) for k in keywords]}
+
+        if original is not None:
+            structure_agent.ahocorasick = original
+            aho_matcher = TermMatcher(brand, competitors, locations)
+            assert aho_matcher._automaton is not None
+            results["aho-corasick"] = [aho_matcher.classify(k) for k in keywords]
+        else:
+            print("⚠️ pyahocorasick not installed; checking the regex path only")
+    finally:
+        structure_agent.ahocorasick = original
+
+    expected = [_reference_classify(k, brand, competitors, locations) for k in keywords]
+    for path, got in results.items():
+        assert got == expected, f"{path} path: {got} != {expected}"
+    # Competitor priority follows list order, not position in the keyword
+    assert expected[2] == (False, "salesforce", False)
+    assert TermMatcher().classify("anything") == (False, None, False)
+
+    print("✅ Term matcher passed!")
+    return True
+
+
+if __name__ == "__main__":
+    success = test_consolidate_merge_precedence() and test_term_matcher_paths_agree()
+    sys.exit(0 if success else 1)
@@ -141,6 +141,47 @@ def test_ui_components():
         return False
 
 
+def test_failed_pipeline_result_not_reused():
+    """An empty pipeline result is not served again from the Streamlit or disk cache."""
+    
+    print("🧪 Testing that failed pipeline runs are not cached...")
+    
+    import tempfile
+    
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "ui"))
+    from ui import app
+    
+    calls = []
+    
+    def fake_run_pipeline(**kwargs):
+        calls.append(kwargs)
+        return CampaignOutputs(search_keywords=[], pmax_themes=[], shopping_target_cpc=0.0)
+    
+    original = app.run_pipeline
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)  # keep the disk cache out of the project tree
+        app.run_pipeline = fake_run_pipeline
+        try:
+            app._cached_run_pipeline.clear()
+            config_json = app._canonical_json({"brand_url": "https://www.example.com"})
+            for _ in range(2):
+                try:
+                    app._cached_run_pipeline(config_json, 5, (), "")
+                    raise AssertionError("empty result should raise")
+                except app._EmptyPipelineResult as e:
+                    assert not e.outputs.search_keywords
+            assert len(calls) == 2, "the failed run was served from cache"
+            assert not os.listdir(os.path.join(tmp, ".cache", "pipeline"))
+        finally:
+            app.run_pipeline = original
+            app._cached_run_pipeline.clear()
+            os.chdir(cwd)
+    
+    print("✅ Failed pipeline runs are retried!")
+    return True
+
+
 if __name__ == "__main__":
-    success = test_ui_components()
+    success = test_ui_components() and test_failed_pipeline_result_not_reused()
     sys.exit(0 if success else 1)
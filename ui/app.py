@@ -1,16 +1,24 @@
 from __future__ import annotations
 
+import hashlib
 import io
 import json
 import os
+import queue
 import sys
 import tempfile
-import yaml
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict
-from typing import List, Optional
+from typing import Callable, List, Optional
 
-import pandas as pd
 import streamlit as st
+from pydantic import BaseModel, Field, ValidationError, field_validator
+
+try:
+    import orjson
+except ImportError:  # stdlib fallback
+    orjson = None
 
 # Ensure project root is on path when running `streamlit run ui/app.py`
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
@@ -18,7 +26,8 @@ if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
 from sem_plan.pipeline import run_pipeline  # noqa: E402
-from sem_plan.core.types import CampaignOutputs, KeywordRecord  # noqa: E402
+from sem_plan.utils.cache import pipeline_cache_get, pipeline_cache_put  # noqa: E402
+from sem_plan.core.types import AdBudgets, CampaignOutputs, Config, KeywordRecord, ProjectSettings  # noqa: E402
 from components.form import render_input_form, render_config_upload  # noqa: E402
 from components.results import render_comprehensive_results  # noqa: E402
 from components.dashboard import render_dashboard  # noqa: E402
@@ -33,45 +42,130 @@ st.set_page_config(
 )
 
 
-def _write_temp_config_yaml(data: dict) -> str:
-    """Write configuration to temporary YAML file."""
-    tmpdir = tempfile.mkdtemp(prefix="sem_plan_")
-    path = os.path.join(tmpdir, "config.yaml")
-    with open(path, "w", encoding="utf-8") as f:
-        yaml.safe_dump(data, f, sort_keys=False, allow_unicode=True)
-    return path
+def _canonical_json(obj) -> bytes:
+    """Key-sorted compact JSON bytes, used for cache keys."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(obj, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def _pipeline_cache_ttl() -> float:
+    """Seconds a persisted pipeline result stays valid; 0 disables the disk cache."""
+    return float(os.getenv("SEM_PLAN_PIPELINE_CACHE_TTL", "86400"))
+
+
+class _EmptyPipelineResult(Exception):
+    """Raised instead of returning an empty result, so st.cache_data does not keep a failed run."""
+
+    def __init__(self, outputs: CampaignOutputs) -> None:
+        super().__init__("The pipeline produced no keywords or themes")
+        self.outputs = outputs
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_run_pipeline(config_json: bytes, max_serp_queries: int, extra_seeds: tuple, llm_context: str, _progress_callback: Optional[Callable[[str, int], None]] = None) -> CampaignOutputs:
+    """Run the pipeline once per distinct config and parameters; reruns hit Streamlit's cache.
+
+    The underscore-prefixed callback is excluded from the cache key. Results are also
+    persisted under .cache/pipeline so they survive new sessions and restarts.
+    """
+    ttl = _pipeline_cache_ttl()
+    digest = hashlib.blake2b(config_json, digest_size=16)
+    digest.update(b"\x00" + _canonical_json([max_serp_queries, list(extra_seeds), llm_context]))
+    key = digest.hexdigest()
+    if ttl > 0:
+        cached = pipeline_cache_get(key, ttl)
+        if cached is not None:
+            return cached
+    
+    outputs = run_pipeline(
+        config=orjson.loads(config_json) if orjson is not None else json.loads(config_json),
+        outputs_dir=tempfile.mkdtemp(prefix="sem_outputs_"),
+        max_serp_queries=max_serp_queries,
+        extra_seeds=list(extra_seeds) if extra_seeds else None,
+        llm_context=llm_context if llm_context else None,
+        progress_callback=_progress_callback,
+    )
+    # Failed fetches or a missing LLM key yield an empty result; keep it out of both caches
+    if not (outputs.search_keywords or outputs.pmax_themes):
+        raise _EmptyPipelineResult(outputs)
+    if ttl > 0:
+        pipeline_cache_put(key, outputs)
+    return outputs
 
 
 def _load_config_from_yaml(yaml_content: str) -> dict:
     """Load configuration from YAML content."""
+    import yaml  # deferred: only needed when a config is uploaded
+    from sem_plan.agents.config_agent import load_yaml
+    
     try:
-        return yaml.safe_load(yaml_content)
+        return load_yaml(yaml_content)
     except yaml.YAMLError as e:
         st.error(f"Invalid YAML format: {e}")
         return None
 
 
-def _validate_config(config: dict) -> bool:
-    """Validate configuration data."""
-    required_fields = ['brand_url', 'competitor_urls', 'service_locations', 'ad_budgets']
-    for field in required_fields:
-        if field not in config:
+class _AdBudgetsInput(BaseModel):
+    search_ads_budget: float = 0
+    shopping_ads_budget: float = 0
+    pmax_ads_budget: float = 0
+
+
+class _ProjectSettingsInput(BaseModel):
+    assumed_conversion_rate: float = 0.02
+    min_search_volume_threshold: Optional[int] = None
+
+
+class SemConfig(BaseModel):
+    """Schema for the configuration collected by the form or uploaded as YAML."""
+
+    brand_url: str = Field(min_length=1)
+    competitor_urls: List[str] = Field(min_length=1)
+    service_locations: List[str] = Field(min_length=1)
+    ad_budgets: _AdBudgetsInput
+    project_settings: _ProjectSettingsInput = Field(default_factory=_ProjectSettingsInput)
+
+    @field_validator("competitor_urls", "service_locations")
+    @classmethod
+    def _dedupe(cls, values: List[str]) -> List[str]:
+        # Order-preserving, so pasted duplicates are not fetched twice downstream
+        return list(dict.fromkeys(values))
+
+    def to_config(self) -> Config:
+        """Convert to the pipeline's Config dataclass so downstream code uses attribute access."""
+        return Config(
+            brand_url=self.brand_url,
+            competitor_urls=list(self.competitor_urls),
+            service_locations=list(self.service_locations),
+            ad_budgets=AdBudgets(**self.ad_budgets.model_dump()),
+            project_settings=ProjectSettings(**self.project_settings.model_dump()),
+        )
+
+
+_FIELD_ERRORS = {
+    "brand_url": "Brand URL is required",
+    "competitor_urls": "At least one competitor URL is required",
+    "service_locations": "At least one service location is required",
+}
+
+
+def _validate_config(config: dict) -> Optional[SemConfig]:
+    """Validate configuration data, returning the typed config or None after reporting the first problem."""
+    try:
+        return SemConfig.model_validate(config)
+    except ValidationError as e:
+        # Report missing fields before invalid values, as the form expects
+        errors = sorted(e.errors(), key=lambda err: err["type"] != "missing")
+        err = errors[0]
+        field = str(err["loc"][0]) if err["loc"] else ""
+        if err["type"] == "missing":
             st.error(f"Missing required field: {field}")
-            return False
-    
-    if not config['brand_url']:
-        st.error("Brand URL is required")
-        return False
-    
-    if not config['competitor_urls']:
-        st.error("At least one competitor URL is required")
-        return False
-    
-    if not config['service_locations']:
-        st.error("At least one service location is required")
-        return False
-    
-    return True
+        elif len(err["loc"]) == 1 and field in _FIELD_ERRORS:
+            st.error(_FIELD_ERRORS[field])
+        else:
+            st.error(f"Invalid {'.'.join(map(str, err['loc']))}: {err['msg']}")
+        return None
 
 
 def _create_config_dict(form_data: tuple) -> dict:
@@ -130,50 +224,46 @@ def main() -> None:
         
         if st.button("🚀 Generate SEM Strategy", type="primary", use_container_width=True):
             config_dict = _create_config_dict(form_data)
-            st.session_state.config_data = config_dict
             
-            if _validate_config(config_dict):
-                _run_pipeline_and_display_results(config_dict, form_data)
+            cfg = _validate_config(config_dict)
+            if cfg is not None:
+                st.session_state.config_data = cfg.to_config()
+                _run_pipeline_and_display_results(cfg.model_dump(), form_data)
     
     else:  # Config File Upload
         st.header("📁 Configuration File Upload")
         config_dict = render_config_upload()
         
         if config_dict and st.button("🚀 Generate SEM Strategy", type="primary", use_container_width=True):
-            st.session_state.config_data = config_dict
-            
-            if _validate_config(config_dict):
+            cfg = _validate_config(config_dict)
+            if cfg is not None:
+                st.session_state.config_data = cfg.to_config()
                 # Use default values for additional parameters
                 default_form_data = (
-                    config_dict.get('brand_url', ''),
-                    config_dict.get('competitor_urls', []),
-                    config_dict.get('service_locations', []),
-                    {
-                        'search_ads_budget': config_dict.get('ad_budgets', {}).get('search_ads_budget', 5000),
-                        'shopping_ads_budget': config_dict.get('ad_budgets', {}).get('shopping_ads_budget', 3000),
-                        'pmax_ads_budget': config_dict.get('ad_budgets', {}).get('pmax_ads_budget', 7000),
-                    },
-                    {
-                        'assumed_conversion_rate': config_dict.get('project_settings', {}).get('assumed_conversion_rate', 0.02),
-                        'min_search_volume_threshold': config_dict.get('project_settings', {}).get('min_search_volume_threshold', 500),
-                    },
+                    cfg.brand_url,
+                    cfg.competitor_urls,
+                    cfg.service_locations,
+                    cfg.ad_budgets.model_dump(),
+                    cfg.project_settings.model_dump(),
                     10,  # max_serp_queries
                     [],  # extra_seeds
                     "",  # llm_context
                     False,  # use_api_metrics
                 )
-                _run_pipeline_and_display_results(config_dict, default_form_data)
+                _run_pipeline_and_display_results(cfg.model_dump(), default_form_data)
     
     # Display results if available
     if st.session_state.results:
         st.header("📊 Results Dashboard")
         render_dashboard(st.session_state.results, st.session_state.config_data)
         
-        st.header("📋 Detailed Results")
-        render_comprehensive_results(st.session_state.results)
-        
-        st.header("💾 Download Results")
-        render_download_section(st.session_state.results)
+        results = st.session_state.results
+        if results.search_keywords or results.pmax_themes:
+            st.header("📋 Detailed Results")
+            render_comprehensive_results(results)
+            
+            st.header("💾 Download Results")
+            render_download_section(results)
 
 
 def _run_pipeline_and_display_results(config_dict: dict, form_data: tuple) -> None:
@@ -183,42 +273,51 @@ def _run_pipeline_and_display_results(config_dict: dict, form_data: tuple) -> No
     extra_seeds = form_data[6] if len(form_data) > 6 else []
     llm_context = form_data[7] if len(form_data) > 7 else ""
     
-    # Create temporary config file
-    cfg_path = _write_temp_config_yaml(config_dict)
-    
     # Progress tracking
     progress_bar = st.progress(0)
     status_text = st.empty()
     
+    # Stage updates arrive from the worker thread; Streamlit calls stay on this one
+    updates: "queue.Queue[tuple[str, int]]" = queue.Queue()
+    
     try:
         status_text.text("🔄 Initializing pipeline...")
-        progress_bar.progress(10)
         
-        status_text.text("🔍 Collecting keywords from multiple sources...")
-        progress_bar.progress(30)
-        
-        status_text.text("📊 Processing and evaluating keywords...")
-        progress_bar.progress(60)
-        
-        status_text.text("🎯 Creating campaign outputs...")
-        progress_bar.progress(80)
-        
-        # Run pipeline
-        outputs = run_pipeline(
-            config_path=cfg_path,
-            outputs_dir=tempfile.mkdtemp(prefix="sem_outputs_"),
-            max_serp_queries=max_serp_queries,
-            extra_seeds=extra_seeds if extra_seeds else None,
-            llm_context=llm_context if llm_context else None,
-        )
+        # Run pipeline off the script thread (cached on the canonical config and parameters)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(
+                _cached_run_pipeline,
+                _canonical_json(config_dict),
+                max_serp_queries,
+                tuple(dict.fromkeys(extra_seeds or ())),
+                llm_context or "",
+                _progress_callback=lambda stage, pct: updates.put((stage, pct)),
+            )
+            while True:
+                done = future.done()
+                while not updates.empty():
+                    stage, pct = updates.get_nowait()
+                    status_text.text(f"🔄 {stage}...")
+                    progress_bar.progress(pct)
+                if done:
+                    break
+                time.sleep(0.1)
+            try:
+                outputs = future.result()
+            except _EmptyPipelineResult as e:
+                outputs = e.outputs
         
         progress_bar.progress(100)
         status_text.text("✅ Analysis complete!")
         
-        # Store results in session state
+        # Store results in session state; a new result needs its own Excel request
         st.session_state.results = outputs
+        st.session_state.excel_requested = False
         
-        st.success("🎉 SEM Strategy generated successfully!")
+        if outputs.search_keywords or outputs.pmax_themes:
+            st.success("🎉 SEM Strategy generated successfully!")
+        else:
+            st.warning("⚠️ No keywords or themes were found. Check network access and API keys, then try again.")
         
     except Exception as e:
         st.error(f"❌ Error during analysis: {str(e)}")
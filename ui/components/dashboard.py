@@ -1,40 +1,156 @@
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 import streamlit as st
-import plotly.express as px
-import plotly.graph_objects as go
-from typing import Dict, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
-from sem_plan.core.types import CampaignOutputs
+from sem_plan.core.types import CampaignOutputs, Config, KeywordRecord
 
+# plotly is imported inside the figure builders: charts only render once results exist
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
 
-def render_dashboard(outputs: CampaignOutputs, config_data: Optional[Dict] = None) -> None:
-    """Render the main dashboard with key metrics and insights."""
+
+_KEYWORD_COLUMNS = ["keyword", "cluster", "intent", "competition", "vol", "gkp_avg_monthly_searches", "cpc_low"]
+
+
+def _keyword_rows(kws: List[KeywordRecord]) -> Tuple[tuple, ...]:
+    """Hashable fingerprint of the keyword fields the dashboard uses, for st.cache_data keys."""
+    return tuple(
+        (k.keyword, k.cluster, k.intent, k.competition, k.numeric_volume, k.gkp_avg_monthly_searches, k.numeric_cpc_low or 1.0)
+        for k in kws
+    )
+
+
+@st.cache_data(show_spinner=False)
+def _keywords_to_df(rows: Tuple[tuple, ...]) -> pd.DataFrame:
+    """Build one frame from the keyword rows with numeric volume/CPC columns."""
+    # Transpose to one array per field; volume and CPC are already normalized per record
+    columns = zip(*rows) if rows else ([] for _ in _KEYWORD_COLUMNS)
+    df = pd.DataFrame({name: np.array(col, dtype=object) for name, col in zip(_KEYWORD_COLUMNS, columns)})
+    df["vol"] = df["vol"].astype("int64")
+    df["cpc_low"] = df["cpc_low"].astype("float64")
+    # Estimated cost uses GKP volume only
+    df["gkp_vol"] = pd.to_numeric(df["gkp_avg_monthly_searches"], errors="coerce").fillna(0).astype("int64")
+    return df
+
+
+@st.cache_data(show_spinner=False)
+def _keyword_metrics(rows: Tuple[tuple, ...]) -> Dict[str, float]:
+    """Aggregate every KPI in one vectorized sweep over the keyword frame."""
+    df = _keywords_to_df(rows)
+    agg = df.assign(
+        cost=df["gkp_vol"] * df["cpc_low"],
+        high_volume=df["vol"] > 1000,
+        low_competition=df["competition"] == "low",
+    ).agg({"vol": ["sum", "mean"], "cost": "sum", "high_volume": "sum", "low_competition": "sum"})
+    return {
+        "total_volume": int(agg.at["sum", "vol"]),
+        "avg_volume": float(agg.at["mean", "vol"]) if len(df) else 0.0,
+        "high_volume_count": int(agg.at["sum", "high_volume"]),
+        "low_competition_count": int(agg.at["sum", "low_competition"]),
+        "estimated_cost": float(agg.at["sum", "cost"]),
+    }
+
+
+@st.cache_data(show_spinner=False)
+def _build_budget_pie(budgets: Tuple[Tuple[str, float], ...]) -> go.Figure:
+    import plotly.graph_objects as go
+    
+    fig = go.Figure(go.Pie(
+        values=[amount for _, amount in budgets],
+        labels=[name for name, _ in budgets],
+    ))
+    fig.update_layout(title="Budget Distribution by Campaign Type")
+    return fig
+
+
+@st.cache_data(show_spinner=False)
+def _build_intent_bar(rows: Tuple[tuple, ...]) -> Optional[go.Figure]:
+    import plotly.graph_objects as go
+    
+    # sort=False keeps intents in order of first appearance
+    intent_counts = _keywords_to_df(rows)["intent"].value_counts(sort=False)
+    
+    if intent_counts.empty:
+        return None
+    fig = go.Figure(go.Bar(x=intent_counts.index, y=intent_counts.values))
+    fig.update_layout(title="Keywords by Intent", xaxis_title="Intent", yaxis_title="Count")
+    return fig
+
+
+@st.cache_data(show_spinner=False)
+def _build_top_keywords_df(rows: Tuple[tuple, ...]) -> pd.DataFrame:
+    top = _keywords_to_df(rows).nlargest(10, "vol")
+    # Typed columns straight from the frame; CPC stays numeric and is formatted by column_config
+    return pd.DataFrame({
+        "Rank": np.arange(1, len(top) + 1, dtype="int32"),
+        "Keyword": top["keyword"].to_numpy(),
+        "Ad Group": top["cluster"].to_numpy(),
+        "Search Volume": top["vol"].to_numpy(dtype="int32"),
+        "CPC": top["cpc_low"].to_numpy(dtype="float64"),
+        "Intent": top["intent"].to_numpy(),
+        "Competition": top["competition"].fillna("medium").to_numpy(),
+    })
+
+
+@st.cache_data(show_spinner=False)
+def _build_summary_df(rows: Tuple[tuple, ...], avg_cpc: float, total_budget: float) -> pd.DataFrame:
+    metrics = _keyword_metrics(rows)
+    total_keywords = len(rows)
+    total_volume = metrics["total_volume"]
+    total_estimated_cost = metrics["estimated_cost"]
+    avg_volume = metrics["avg_volume"]
+    
+    summary_data = {
+        "Metric": [
+            "Total Keywords",
+            "Average Search Volume",
+            "Total Monthly Volume",
+            "Average CPC",
+            "Estimated Monthly Cost",
+            "Budget Utilization"
+        ],
+        "Value": [
+            str(total_keywords),
+            str(f"{avg_volume:.0f}"),
+            str(f"{total_volume:,}"),
+            str(f"${avg_cpc:.2f}"),
+            str(f"${total_estimated_cost:.0f}"),
+            str(f"{(total_estimated_cost/total_budget)*100:.1f}%" if total_budget > 0 else "N/A")
+        ]
+    }
+    return pd.DataFrame(summary_data)
+
+
+@st.fragment
+def render_dashboard(outputs: CampaignOutputs, config_data: Optional[Config] = None) -> None:
+    """Render the main dashboard with key metrics and insights.
+
+    Runs as a fragment, so interactions inside the dashboard rerun only this function.
+    """
+    if not outputs.search_keywords:
+        st.info("No keywords generated yet.")
+        return
     
     # Key Performance Indicators
     st.subheader("🎯 Key Performance Indicators")
     
     # Calculate metrics
     total_keywords = len(outputs.search_keywords)
-    
-    # Calculate total volume with proper type handling
-    total_volume = 0
-    for kw in outputs.search_keywords:
-        volume = kw.gkp_avg_monthly_searches or kw.volume or 0
-        if volume is not None:
-            try:
-                total_volume += int(volume)
-            except (ValueError, TypeError):
-                continue
+    rows = _keyword_rows(outputs.search_keywords)
+    metrics = _keyword_metrics(rows)
+    total_volume = metrics["total_volume"]
     
     avg_cpc = outputs.shopping_target_cpc
     
     # Budget allocation
-    if config_data and 'ad_budgets' in config_data:
-        search_budget = config_data['ad_budgets'].get('search_ads_budget', 0)
-        shopping_budget = config_data['ad_budgets'].get('shopping_ads_budget', 0)
-        pmax_budget = config_data['ad_budgets'].get('pmax_ads_budget', 0)
+    if config_data is not None:
+        budgets = config_data.ad_budgets
+        search_budget = budgets.search_ads_budget
+        shopping_budget = budgets.shopping_ads_budget
+        pmax_budget = budgets.pmax_ads_budget
         total_budget = search_budget + shopping_budget + pmax_budget
     else:
         total_budget = 15000  # Default
@@ -66,7 +182,7 @@ def render_dashboard(outputs: CampaignOutputs, config_data: Optional[Dict] = Non
     with col4:
         st.metric(
             "Total Budget",
-            f"${total_budget:,}",
+            f"${total_budget:,.0f}",
             help="Monthly advertising budget across all campaigns"
         )
     
@@ -77,83 +193,29 @@ def render_dashboard(outputs: CampaignOutputs, config_data: Optional[Dict] = Non
     
     with col1:
         # Budget Distribution
-        if config_data and 'ad_budgets' in config_data:
-            budget_data = {
-                'Search Ads': search_budget,
-                'Shopping Ads': shopping_budget,
-                'PMax Ads': pmax_budget
-            }
-            
-            fig = px.pie(
-                values=list(budget_data.values()),
-                names=list(budget_data.keys()),
-                title="Budget Distribution by Campaign Type"
-            )
+        if config_data is not None:
+            fig = _build_budget_pie((
+                ('Search Ads', search_budget),
+                ('Shopping Ads', shopping_budget),
+                ('PMax Ads', pmax_budget),
+            ))
             st.plotly_chart(fig, use_container_width=True, key="budget_distribution_pie")
     
     with col2:
         # Keyword Distribution by Intent
-        if outputs.search_keywords:
-            intent_counts = {}
-            for kw in outputs.search_keywords:
-                intent = kw.intent
-                intent_counts[intent] = intent_counts.get(intent, 0) + 1
-            
-            if intent_counts:
-                fig = px.bar(
-                    x=list(intent_counts.keys()),
-                    y=list(intent_counts.values()),
-                    title="Keywords by Intent",
-                    labels={"x": "Intent", "y": "Count"}
-                )
-                st.plotly_chart(fig, use_container_width=True, key="dashboard_intent_bar")
+        fig = _build_intent_bar(rows)
+        if fig is not None:
+            st.plotly_chart(fig, use_container_width=True, key="dashboard_intent_bar")
     
     # Top Performing Keywords
     st.subheader("🏆 Top Performing Keywords")
     
-    if outputs.search_keywords:
-        # Sort by search volume
-        def get_volume(kw):
-            volume = kw.gkp_avg_monthly_searches or kw.volume or 0
-            if volume is not None:
-                try:
-                    return int(volume)
-                except (ValueError, TypeError):
-                    return 0
-            return 0
-        
-        sorted_keywords = sorted(
-            outputs.search_keywords,
-            key=get_volume,
-            reverse=True
-        )
-        
-        # Create top keywords dataframe
-        top_keywords_data = []
-        for i, kw in enumerate(sorted_keywords[:10]):
-            # Ensure volume is an integer
-            volume = kw.gkp_avg_monthly_searches or kw.volume or 0
-            if volume is not None:
-                try:
-                    volume = int(volume)
-                except (ValueError, TypeError):
-                    volume = 0
-            else:
-                volume = 0
-            
-            cpc_low = kw.gkp_top_of_page_bid_low or 1.0
-            top_keywords_data.append({
-                "Rank": i + 1,
-                "Keyword": kw.keyword,
-                "Ad Group": kw.cluster,
-                "Search Volume": volume,
-                "CPC": f"${cpc_low:.2f}",
-                "Intent": kw.intent,
-                "Competition": kw.competition or "medium"
-            })
-        
-        top_df = pd.DataFrame(top_keywords_data)
-        st.dataframe(top_df, use_container_width=True)
+    top_df = _build_top_keywords_df(rows)
+    st.dataframe(
+        top_df,
+        use_container_width=True,
+        column_config={"CPC": st.column_config.NumberColumn(format="$%.2f")},
+    )
     
     # Strategic Insights
     st.subheader("💡 Strategic Insights")
@@ -163,35 +225,24 @@ def render_dashboard(outputs: CampaignOutputs, config_data: Optional[Dict] = Non
     with col1:
         st.info("**🎯 Campaign Recommendations**")
         
-        if outputs.search_keywords:
-            # Analyze keyword distribution
-            high_volume_keywords = []
-            for kw in outputs.search_keywords:
-                volume = kw.gkp_avg_monthly_searches or kw.volume or 0
-                if volume is not None:
-                    try:
-                        volume = int(volume)
-                        if volume > 1000:
-                            high_volume_keywords.append(kw)
-                    except (ValueError, TypeError):
-                        continue
-            low_competition_keywords = [kw for kw in outputs.search_keywords 
-                                      if kw.competition == "low"]
-            
-            st.write(f"• **{len(high_volume_keywords)}** high-volume keywords (>1K searches)")
-            st.write(f"• **{len(low_competition_keywords)}** low-competition opportunities")
-            st.write(f"• **{len(outputs.pmax_themes)}** PMax themes identified")
-            
-            if high_volume_keywords:
-                st.write("• Focus on high-volume keywords for immediate impact")
-            if low_competition_keywords:
-                st.write("• Target low-competition keywords for cost efficiency")
+        # Analyze keyword distribution
+        high_volume_count = metrics["high_volume_count"]
+        low_competition_count = metrics["low_competition_count"]
+        
+        st.write(f"• **{high_volume_count}** high-volume keywords (>1K searches)")
+        st.write(f"• **{low_competition_count}** low-competition opportunities")
+        st.write(f"• **{len(outputs.pmax_themes)}** PMax themes identified")
+        
+        if high_volume_count:
+            st.write("• Focus on high-volume keywords for immediate impact")
+        if low_competition_count:
+            st.write("• Target low-competition keywords for cost efficiency")
     
     with col2:
         st.info("**💰 Budget Optimization**")
         
-        if config_data and 'project_settings' in config_data:
-            conv_rate = config_data['project_settings'].get('assumed_conversion_rate', 0.02)
+        if config_data is not None:
+            conv_rate = config_data.project_settings.assumed_conversion_rate
             target_cpa = total_budget / (total_volume * conv_rate) if total_volume > 0 else 0
             
             st.write(f"• Target CPA: **${target_cpa:.2f}**")
@@ -205,39 +256,5 @@ def render_dashboard(outputs: CampaignOutputs, config_data: Optional[Dict] = Non
     
     # Performance Summary
     with st.expander("📈 Performance Summary", expanded=False):
-        if outputs.search_keywords:
-            # Calculate performance metrics
-            total_estimated_cost = 0
-            for kw in outputs.search_keywords:
-                volume = kw.gkp_avg_monthly_searches or 0
-                if volume is not None:
-                    try:
-                        volume = int(volume)
-                        cpc = kw.gkp_top_of_page_bid_low or 1.0
-                        total_estimated_cost += volume * cpc
-                    except (ValueError, TypeError):
-                        continue
-            
-            avg_volume = total_volume / len(outputs.search_keywords) if outputs.search_keywords else 0
-            
-            summary_data = {
-                "Metric": [
-                    "Total Keywords",
-                    "Average Search Volume",
-                    "Total Monthly Volume",
-                    "Average CPC",
-                    "Estimated Monthly Cost",
-                    "Budget Utilization"
-                ],
-                "Value": [
-                    str(total_keywords),
-                    str(f"{avg_volume:.0f}"),
-                    str(f"{total_volume:,}"),
-                    str(f"${avg_cpc:.2f}"),
-                    str(f"${total_estimated_cost:.0f}"),
-                    str(f"{(total_estimated_cost/total_budget)*100:.1f}%" if total_budget > 0 else "N/A")
-                ]
-            }
-            
-            summary_df = pd.DataFrame(summary_data)
-            st.dataframe(summary_df, use_container_width=True)
+        summary_df = _build_summary_df(rows, avg_cpc, total_budget)
+        st.dataframe(summary_df, use_container_width=True)
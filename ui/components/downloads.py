@@ -1,311 +1,265 @@
 from __future__ import annotations
 
+import csv
+import importlib.util
 import io
 import json
+import re
+import numpy as np
 import pandas as pd
 import streamlit as st
-from typing import Dict, List
+from typing import Dict, List, Optional
 from datetime import datetime
+from functools import lru_cache
+from operator import attrgetter
 
 from sem_plan.core.types import CampaignOutputs, KeywordRecord
 
+try:
+    import orjson
+except ImportError:  # stdlib fallback
+    orjson = None
 
-def _create_search_keywords_csv(outputs: CampaignOutputs) -> tuple[str, bytes]:
+# Checked once; openpyxl itself is only imported when a report is built
+_HAS_OPENPYXL = importlib.util.find_spec("openpyxl") is not None
+_HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+
+def _json_bytes(obj) -> bytes:
+    """Indented JSON bytes for downloads; datetimes are written in ISO format."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, indent=2, default=lambda o: o.isoformat()).encode('utf-8')
+
+
+_KEYWORD_COLUMNS = (
+    "keyword", "cluster", "match_type", "intent", "competition", "sources",
+    "gkp_avg_monthly_searches", "volume", "gkp_top_of_page_bid_low", "gkp_top_of_page_bid_high",
+)
+# One C-level call per record instead of ten attribute lookups
+_keyword_fields = attrgetter(*_KEYWORD_COLUMNS)
+
+
+def _keyword_fields_frame(records: List[KeywordRecord]) -> pd.DataFrame:
+    """Raw keyword record fields, one row per record; dtype=object keeps None as None rather than NaN."""
+    return pd.DataFrame(map(_keyword_fields, records), columns=list(_KEYWORD_COLUMNS), dtype=object)
+
+
+def _numeric_or_nan(col: pd.Series) -> pd.Series:
+    """Coerce to float, treating missing, zero and non-numeric values alike (as `x or default` would)."""
+    values = pd.to_numeric(col, errors="coerce")
+    return values.mask(values == 0)
+
+
+@st.cache_data(show_spinner=False)
+def _outputs_to_df(outputs: CampaignOutputs) -> pd.DataFrame:
+    """Keyword table shared by every exporter, with volume and CPCs coerced once."""
+    df = _keyword_fields_frame(outputs.search_keywords)
+    df["competition_label"] = [competition or "medium" for competition in df["competition"]]
+    df["sources"] = [", ".join(sources) if sources else "Unknown" for sources in df["sources"]]
+    
+    # `gkp or volume or 0`, then int
+    df["volume"] = _numeric_or_nan(df["gkp_avg_monthly_searches"]).fillna(_numeric_or_nan(df["volume"])).fillna(0).astype("int64")
+    # Raw low bid is kept (NaN when absent) for exporters with their own fallback
+    df["bid_low"] = _numeric_or_nan(df["gkp_top_of_page_bid_low"])
+    df["cpc_low"] = df["bid_low"].fillna(1.0)
+    df["cpc_high"] = _numeric_or_nan(df["gkp_top_of_page_bid_high"]).fillna(2.0)
+    df["roi_potential"] = _roi_potential(df["volume"], df["cpc_low"], df["intent"])
+    return df.drop(columns=["gkp_avg_monthly_searches", "gkp_top_of_page_bid_low", "gkp_top_of_page_bid_high"])
+
+
+def _top_by_volume(df: pd.DataFrame, n: int) -> pd.DataFrame:
+    """The `n` highest-volume rows, ties kept in keyword order (like a stable descending sort)."""
+    vols = df["volume"].to_numpy()
+    k = min(n, len(vols))
+    if not k:
+        return df.iloc[:0]
+    # O(N) partition for the cut-off, then a stable sort of the few candidates
+    cutoff = np.partition(vols, len(vols) - k)[len(vols) - k]
+    candidates = np.flatnonzero(vols >= cutoff)
+    return df.iloc[candidates[np.argsort(-vols[candidates], kind="stable")][:k]]
+
+
+def _search_keywords_table(df: pd.DataFrame) -> pd.DataFrame:
+    """Search keyword export rows, sorted by ad group and then volume."""
+    volume = df["volume"]
+    cpc_low = df["cpc_low"]
+    cpc_high = df["cpc_high"]
+    
+    table = pd.DataFrame({
+        "Ad Group": df["cluster"],
+        "Keyword": df["keyword"],
+        "Match Type": df["match_type"],
+        "Intent": df["intent"],
+        "Competition": df["competition_label"],
+        "Avg Monthly Searches": volume,
+        "CPC Low ($)": cpc_low,
+        "CPC High ($)": cpc_high,
+        "CPC Range": [f"${lo:.2f} - ${hi:.2f}" for lo, hi in zip(cpc_low, cpc_high)],
+        "Sources": df["sources"],
+        "Estimated Monthly Cost": (volume * cpc_low).where(volume != 0, 0),
+        "ROI Potential": df["roi_potential"],
+    })
+    return table.sort_values(["Ad Group", "Avg Monthly Searches"], ascending=[True, False])
+
+
+@st.cache_data(show_spinner=False)
+def _create_search_keywords_csv(outputs: CampaignOutputs, _df: Optional[pd.DataFrame] = None) -> tuple[str, bytes]:
     """Create comprehensive search keywords CSV."""
-    data = []
-    for kw in outputs.search_keywords:
-        # Ensure volume is an integer
-        volume = kw.gkp_avg_monthly_searches or kw.volume or 0
-        if volume is not None:
-            try:
-                volume = int(volume)
-            except (ValueError, TypeError):
-                volume = 0
-        else:
-            volume = 0
-        
-        cpc_low = kw.gkp_top_of_page_bid_low or 1.0
-        cpc_high = kw.gkp_top_of_page_bid_high or 2.0
-        
-        data.append({
-            "Ad Group": kw.cluster,
-            "Keyword": kw.keyword,
-            "Match Type": kw.match_type,
-            "Intent": kw.intent,
-            "Competition": kw.competition or "medium",
-            "Avg Monthly Searches": volume,
-            "CPC Low ($)": cpc_low,
-            "CPC High ($)": cpc_high,
-            "CPC Range": f"${cpc_low:.2f} - ${cpc_high:.2f}",
-            "Sources": ", ".join(kw.sources) if kw.sources else "Unknown",
-            "Estimated Monthly Cost": volume * cpc_low if volume and cpc_low else 0,
-            "ROI Potential": _calculate_roi_potential(volume, cpc_low, kw.intent)
-        })
-    
-    df = pd.DataFrame(data)
-    df = df.sort_values(["Ad Group", "Avg Monthly Searches"], ascending=[True, False])
+    df = _search_keywords_table(_outputs_to_df(outputs) if _df is None else _df)
     
     bio = io.BytesIO()
     df.to_csv(bio, index=False)
     return "search_campaign_keywords.csv", bio.getvalue()
 
 
-def _create_pmax_themes_csv(outputs: CampaignOutputs) -> tuple[str, bytes]:
-    """Create PMax themes CSV."""
-    data = []
-    for i, theme in enumerate(outputs.pmax_themes):
-        data.append({
-            "Theme ID": i + 1,
-            "Theme": theme,
-            "Category": _categorize_pmax_theme(theme),
-            "Description": _generate_theme_description(theme)
-        })
-    
-    df = pd.DataFrame(data)
+@st.cache_data(show_spinner=False)
+def _create_search_keywords_feather(outputs: CampaignOutputs, _df: Optional[pd.DataFrame] = None) -> tuple[str, bytes]:
+    """Create the search keywords table as a zstd-compressed Feather file."""
+    df = _search_keywords_table(_outputs_to_df(outputs) if _df is None else _df)
     
     bio = io.BytesIO()
-    df.to_csv(bio, index=False)
-    return "pmax_themes.csv", bio.getvalue()
+    df.reset_index(drop=True).to_feather(bio, compression="zstd")
+    return "search_campaign_keywords.feather", bio.getvalue()
+
+
+@st.cache_data(show_spinner=False)
+def _create_pmax_themes_csv(outputs: CampaignOutputs) -> tuple[str, bytes]:
+    """Create PMax themes CSV."""
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow(["Theme ID", "Theme", "Category", "Description"])
+    for i, theme in enumerate(outputs.pmax_themes, 1):
+        writer.writerow([i, theme, _categorize_pmax_theme(theme), _generate_theme_description(theme)])
+    return "pmax_themes.csv", buf.getvalue().encode()
 
 
-def _create_shopping_cpc_csv(outputs: CampaignOutputs) -> tuple[str, bytes]:
+@st.cache_data(show_spinner=False)
+def _create_shopping_cpc_csv(outputs: CampaignOutputs, _df: Optional[pd.DataFrame] = None) -> tuple[str, bytes]:
     """Create shopping CPC recommendations CSV."""
-    data = []
+    df = _outputs_to_df(outputs) if _df is None else _df
     
     # Calculate shopping metrics
-    total_volume = 0
-    for kw in outputs.search_keywords:
-        volume = kw.gkp_avg_monthly_searches or kw.volume or 0
-        if volume is not None:
-            try:
-                total_volume += int(volume)
-            except (ValueError, TypeError):
-                continue
+    total_volume = int(df["volume"].sum())
     avg_cpc = outputs.shopping_target_cpc
     
-    data.append({
-        "Metric": "Target CPC",
-        "Value": str(f"${avg_cpc:.2f}"),
-        "Description": "Recommended target cost-per-click for shopping campaigns"
-    })
-    
-    data.append({
-        "Metric": "Total Search Volume",
-        "Value": str(f"{total_volume:,}"),
-        "Description": "Combined monthly search volume across all keywords"
-    })
-    
-    data.append({
-        "Metric": "Estimated Monthly Spend",
-        "Value": str(f"${total_volume * avg_cpc:.0f}"),
-        "Description": "Estimated monthly spend based on target CPC"
-    })
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow(["Metric", "Value", "Description"])
+    writer.writerows([
+        ("Target CPC", f"${avg_cpc:.2f}", "Recommended target cost-per-click for shopping campaigns"),
+        ("Total Search Volume", f"{total_volume:,}", "Combined monthly search volume across all keywords"),
+        ("Estimated Monthly Spend", f"${total_volume * avg_cpc:.0f}", "Estimated monthly spend based on target CPC"),
+    ])
     
     # Add keyword-level recommendations
-    for kw in outputs.search_keywords:
-        if kw.intent in ["transactional", "commercial"]:
-            volume = kw.gkp_avg_monthly_searches or kw.volume or 0
-            if volume is not None:
-                try:
-                    volume = int(volume)
-                except (ValueError, TypeError):
-                    volume = 0
-            else:
-                volume = 0
-            
-            cpc_low = kw.gkp_top_of_page_bid_low or avg_cpc
-            
-            data.append({
-                "Metric": f"Keyword: {kw.keyword}",
-                "Value": str(f"${cpc_low:.2f}"),
-                "Description": f"Volume: {volume:,}, Intent: {kw.intent}, Competition: {kw.competition}"
-            })
-    
-    df = pd.DataFrame(data)
+    buying = df[df["intent"].isin(["transactional", "commercial"])]
+    writer.writerows(
+        (f"Keyword: {keyword}", f"${cpc_low:.2f}", f"Volume: {volume:,}, Intent: {intent}, Competition: {competition}")
+        for keyword, volume, cpc_low, intent, competition in zip(
+            buying["keyword"], buying["volume"].tolist(), buying["bid_low"].fillna(avg_cpc).tolist(), buying["intent"], buying["competition"]
+        )
+    )
     
-    bio = io.BytesIO()
-    df.to_csv(bio, index=False)
-    return "shopping_cpc_recommendations.csv", bio.getvalue()
+    return "shopping_cpc_recommendations.csv", buf.getvalue().encode()
 
 
-def _create_campaign_summary_json(outputs: CampaignOutputs) -> tuple[str, bytes]:
+@st.cache_data(show_spinner=False)
+def _create_campaign_summary_json(outputs: CampaignOutputs, _df: Optional[pd.DataFrame] = None) -> tuple[str, bytes]:
     """Create comprehensive campaign summary JSON."""
+    df = _outputs_to_df(outputs) if _df is None else _df
     summary = {
-        "generated_at": datetime.now().isoformat(),
+        "generated_at": datetime.now(),
         "campaign_overview": {
             "total_keywords": len(outputs.search_keywords),
             "pmax_themes_count": len(outputs.pmax_themes),
             "shopping_target_cpc": outputs.shopping_target_cpc,
-            "total_search_volume": sum(
-                int(kw.gkp_avg_monthly_searches or kw.volume or 0) 
-                for kw in outputs.search_keywords 
-                if kw.gkp_avg_monthly_searches is not None or kw.volume is not None
-            )
+            "total_search_volume": int(df["volume"].sum())
         },
         "ad_groups": {},
         "intent_distribution": {},
         "competition_distribution": {},
         "top_keywords": [],
         "pmax_themes": outputs.pmax_themes,
-        "recommendations": _generate_strategic_recommendations(outputs)
+        "recommendations": _generate_strategic_recommendations(outputs, df)
     }
     
-    # Ad group analysis
-    ad_groups = {}
-    for kw in outputs.search_keywords:
-        ad_group = kw.cluster
-        if ad_group not in ad_groups:
-            ad_groups[ad_group] = {
-                "keywords": [],
-                "total_volume": 0,
-                "avg_cpc": 0,
-                "intents": set()
-            }
-        
-        volume = kw.gkp_avg_monthly_searches or kw.volume or 0
-        if volume is not None:
-            try:
-                volume = int(volume)
-            except (ValueError, TypeError):
-                volume = 0
-        else:
-            volume = 0
-        
-        cpc = kw.gkp_top_of_page_bid_low or 1.0
-        
-        ad_groups[ad_group]["keywords"].append(kw.keyword)
-        ad_groups[ad_group]["total_volume"] += volume
-        ad_groups[ad_group]["intents"].add(kw.intent)
-    
-    # Calculate averages and convert sets to lists
-    for ad_group, data in ad_groups.items():
-        data["avg_cpc"] = data["total_volume"] / len(data["keywords"]) if data["keywords"] else 0
-        data["intents"] = list(data["intents"])
-        summary["ad_groups"][ad_group] = data
-    
-    # Intent distribution
-    intent_counts = {}
-    for kw in outputs.search_keywords:
-        intent = kw.intent
-        intent_counts[intent] = intent_counts.get(intent, 0) + 1
-    summary["intent_distribution"] = intent_counts
-    
-    # Competition distribution
-    competition_counts = {}
-    for kw in outputs.search_keywords:
-        competition = kw.competition or "medium"
-        competition_counts[competition] = competition_counts.get(competition, 0) + 1
-    summary["competition_distribution"] = competition_counts
-    
-    # Top keywords
-    def get_volume(kw):
-        volume = kw.gkp_avg_monthly_searches or kw.volume or 0
-        if volume is not None:
-            try:
-                return int(volume)
-            except (ValueError, TypeError):
-                return 0
-        return 0
-    
-    sorted_keywords = sorted(
-        outputs.search_keywords,
-        key=get_volume,
-        reverse=True
+    # Ad group analysis, in order of first appearance
+    groups = df.groupby("cluster", sort=False).agg(
+        keywords=("keyword", list),
+        total_volume=("volume", "sum"),
+        keyword_count=("keyword", "size"),
+        intents=("intent", lambda s: list(pd.unique(s))),
     )
+    groups["avg_cpc"] = groups["total_volume"] / groups["keyword_count"]
+    summary["ad_groups"] = groups[["keywords", "total_volume", "avg_cpc", "intents"]].to_dict(orient="index")
     
-    for kw in sorted_keywords[:10]:
-        volume = kw.gkp_avg_monthly_searches or kw.volume or 0
-        if volume is not None:
-            try:
-                volume = int(volume)
-            except (ValueError, TypeError):
-                volume = 0
-        else:
-            volume = 0
-        
+    # Intent and competition distribution
+    summary["intent_distribution"] = df["intent"].value_counts(sort=False).to_dict()
+    summary["competition_distribution"] = df["competition_label"].value_counts(sort=False).to_dict()
+    
+    # Top keywords
+    top = _top_by_volume(df, 10)
+    for keyword, ad_group, volume, cpc, intent, competition in zip(
+        top["keyword"], top["cluster"], top["volume"].tolist(), top["cpc_low"].tolist(), top["intent"], top["competition_label"]
+    ):
         summary["top_keywords"].append({
-            "keyword": kw.keyword,
-            "ad_group": kw.cluster,
+            "keyword": keyword,
+            "ad_group": ad_group,
             "search_volume": volume,
-            "cpc": kw.gkp_top_of_page_bid_low or 1.0,
-            "intent": kw.intent,
-            "competition": kw.competition or "medium"
+            "cpc": cpc,
+            "intent": intent,
+            "competition": competition
         })
     
-    bio = io.BytesIO()
-    bio.write(json.dumps(summary, indent=2).encode('utf-8'))
-    return "campaign_summary.json", bio.getvalue()
+    return "campaign_summary.json", _json_bytes(summary)
 
 
-def _create_excel_report(outputs: CampaignOutputs) -> tuple[str, bytes]:
+@st.cache_data(show_spinner=False)
+def _create_excel_report(outputs: CampaignOutputs, _df: Optional[pd.DataFrame] = None) -> tuple[str, bytes]:
     """Create comprehensive Excel report with multiple sheets."""
     from openpyxl import Workbook
-    from openpyxl.styles import Font, PatternFill, Alignment
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font, PatternFill
     
-    wb = Workbook()
+    df = _outputs_to_df(outputs) if _df is None else _df
     
-    # Search Keywords Sheet
-    ws1 = wb.active
-    ws1.title = "Search Keywords"
+    # Write-only mode streams whole rows instead of materialising a Cell per value
+    wb = Workbook(write_only=True)
+    
+    def header_row(ws, headers, fill=None):
+        cells = []
+        for header in headers:
+            cell = WriteOnlyCell(ws, value=header)
+            cell.font = Font(bold=True)
+            if fill is not None:
+                cell.fill = fill
+            cells.append(cell)
+        return cells
     
-    # Headers
+    # Search Keywords Sheet
+    ws1 = wb.create_sheet("Search Keywords")
     headers = ["Ad Group", "Keyword", "Match Type", "Intent", "Competition", 
                "Avg Monthly Searches", "CPC Low ($)", "CPC High ($)", "ROI Potential"]
+    ws1.append(header_row(ws1, headers, PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")))
     
-    for col, header in enumerate(headers, 1):
-        cell = ws1.cell(row=1, column=col, value=header)
-        cell.font = Font(bold=True)
-        cell.fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
-    
-    # Data
-    row = 2
-    for kw in outputs.search_keywords:
-        volume = kw.gkp_avg_monthly_searches or kw.volume or 0
-        if volume is not None:
-            try:
-                volume = int(volume)
-            except (ValueError, TypeError):
-                volume = 0
-        else:
-            volume = 0
-        
-        cpc_low = kw.gkp_top_of_page_bid_low or 1.0
-        cpc_high = kw.gkp_top_of_page_bid_high or 2.0
-        
-        ws1.cell(row=row, column=1, value=kw.cluster)
-        ws1.cell(row=row, column=2, value=kw.keyword)
-        ws1.cell(row=row, column=3, value=kw.match_type)
-        ws1.cell(row=row, column=4, value=kw.intent)
-        ws1.cell(row=row, column=5, value=kw.competition or "medium")
-        ws1.cell(row=row, column=6, value=volume)
-        ws1.cell(row=row, column=7, value=cpc_low)
-        ws1.cell(row=row, column=8, value=cpc_high)
-        ws1.cell(row=row, column=9, value=_calculate_roi_potential(volume, cpc_low, kw.intent))
-        row += 1
+    for row in zip(
+        df["cluster"], df["keyword"], df["match_type"], df["intent"], df["competition_label"],
+        df["volume"].tolist(), df["cpc_low"].tolist(), df["cpc_high"].tolist(), df["roi_potential"],
+    ):
+        ws1.append(row)
     
     # PMax Themes Sheet
     ws2 = wb.create_sheet("PMax Themes")
-    ws2.cell(row=1, column=1, value="Theme").font = Font(bold=True)
-    ws2.cell(row=1, column=2, value="Category").font = Font(bold=True)
-    
-    for i, theme in enumerate(outputs.pmax_themes, 2):
-        ws2.cell(row=i, column=1, value=theme)
-        ws2.cell(row=i, column=2, value=_categorize_pmax_theme(theme))
+    ws2.append(header_row(ws2, ["Theme", "Category"]))
+    for theme in outputs.pmax_themes:
+        ws2.append((theme, _categorize_pmax_theme(theme)))
     
     # Summary Sheet
     ws3 = wb.create_sheet("Summary")
-    ws3.cell(row=1, column=1, value="Metric").font = Font(bold=True)
-    ws3.cell(row=1, column=2, value="Value").font = Font(bold=True)
-    
-    # Calculate total search volume with proper type handling
-    total_volume = 0
-    for kw in outputs.search_keywords:
-        volume = kw.gkp_avg_monthly_searches or kw.volume or 0
-        if volume is not None:
-            try:
-                total_volume += int(volume)
-            except (ValueError, TypeError):
-                continue
+    ws3.append(header_row(ws3, ["Metric", "Value"]))
+    
+    total_volume = int(df["volume"].sum())
     
     summary_data = [
         ("Total Keywords", len(outputs.search_keywords)),
@@ -313,10 +267,8 @@ def _create_excel_report(outputs: CampaignOutputs) -> tuple[str, bytes]:
         ("Shopping Target CPC", f"${outputs.shopping_target_cpc:.2f}"),
         ("Total Search Volume", total_volume)
     ]
-    
-    for i, (metric, value) in enumerate(summary_data, 2):
-        ws3.cell(row=i, column=1, value=metric)
-        ws3.cell(row=i, column=2, value=value)
+    for row in summary_data:
+        ws3.append(row)
     
     # Save to bytes
     bio = io.BytesIO()
@@ -324,86 +276,79 @@ def _create_excel_report(outputs: CampaignOutputs) -> tuple[str, bytes]:
     return "comprehensive_sem_report.xlsx", bio.getvalue()
 
 
-def _calculate_roi_potential(volume: int, cpc: float, intent: str) -> str:
-    """Calculate ROI potential based on volume, CPC, and intent."""
-    if volume == 0 or cpc == 0:
-        return "Unknown"
-    
-    volume_score = min(volume / 1000, 5)
-    cpc_efficiency = max(1 - (cpc / 5), 0)
-    
-    intent_multiplier = {
-        "transactional": 1.5,
-        "commercial": 1.2,
-        "informational": 0.8,
-        "navigational": 0.6
-    }.get(intent, 1.0)
-    
-    total_score = (volume_score + cpc_efficiency) * intent_multiplier
-    
-    if total_score >= 4:
-        return "High"
-    elif total_score >= 2:
-        return "Medium"
-    else:
-        return "Low"
+_INTENT_MULTIPLIER = {
+    "transactional": 1.5,
+    "commercial": 1.2,
+    "informational": 0.8,
+    "navigational": 0.6
+}
+
+
+def _roi_potential(volume: pd.Series, cpc: pd.Series, intent: pd.Series) -> np.ndarray:
+    """Calculate ROI potential based on volume, CPC, and intent, for a whole column at once."""
+    volume_score = np.minimum(volume / 1000, 5)
+    cpc_efficiency = np.maximum(1 - (cpc / 5), 0)
+    intent_multiplier = intent.map(_INTENT_MULTIPLIER).fillna(1.0).astype(float)
+    
+    total_score = ((volume_score + cpc_efficiency) * intent_multiplier).to_numpy()
+    
+    return np.where(
+        (volume == 0).to_numpy() | (cpc == 0).to_numpy(),
+        "Unknown",
+        np.select([total_score >= 4, total_score >= 2], ["High", "Medium"], default="Low"),
+    ).astype(object)
+
 
+# Checked in order: the first category with any substring hit wins, wherever
+# in the theme the hit is, so this is one pattern per category rather than a
+# single alternation (which would pick the leftmost hit instead).
+_THEME_CATEGORIES = [
+    (re.compile("product|service|solution"), "Product Category"),
+    (re.compile("use|case|scenario|workflow"), "Use Case"),
+    (re.compile("professional|business|enterprise|team"), "Demographic"),
+    (re.compile("seasonal|event|time|period"), "Seasonal/Event"),
+]
 
+
+@lru_cache(maxsize=512)
 def _categorize_pmax_theme(theme: str) -> str:
     """Categorize PMax theme based on content."""
     theme_lower = theme.lower()
-    
-    if any(word in theme_lower for word in ["product", "service", "solution"]):
-        return "Product Category"
-    elif any(word in theme_lower for word in ["use", "case", "scenario", "workflow"]):
-        return "Use Case"
-    elif any(word in theme_lower for word in ["professional", "business", "enterprise", "team"]):
-        return "Demographic"
-    elif any(word in theme_lower for word in ["seasonal", "event", "time", "period"]):
-        return "Seasonal/Event"
-    else:
-        return "General"
+    for pattern, category in _THEME_CATEGORIES:
+        if pattern.search(theme_lower):
+            return category
+    return "General"
+
+
+_THEME_DESCRIPTIONS = {
+    "Product Category": "Focus on specific product or service offerings",
+    "Use Case": "Target specific use cases and scenarios",
+    "Demographic": "Target specific audience segments",
+    "Seasonal/Event": "Time-based or seasonal campaigns",
+    "General": "Broad campaign theme"
+}
 
 
 def _generate_theme_description(theme: str) -> str:
     """Generate description for PMax theme."""
-    category = _categorize_pmax_theme(theme)
-    
-    descriptions = {
-        "Product Category": "Focus on specific product or service offerings",
-        "Use Case": "Target specific use cases and scenarios",
-        "Demographic": "Target specific audience segments",
-        "Seasonal/Event": "Time-based or seasonal campaigns",
-        "General": "Broad campaign theme"
-    }
-    
-    return descriptions.get(category, "General campaign theme")
+    return _THEME_DESCRIPTIONS.get(_categorize_pmax_theme(theme), "General campaign theme")
 
 
-def _generate_strategic_recommendations(outputs: CampaignOutputs) -> List[str]:
+def _generate_strategic_recommendations(outputs: CampaignOutputs, df: Optional[pd.DataFrame] = None) -> List[str]:
     """Generate strategic recommendations based on analysis."""
     recommendations = []
     
     if outputs.search_keywords:
-        high_volume_keywords = []
-        for kw in outputs.search_keywords:
-            volume = kw.gkp_avg_monthly_searches or kw.volume or 0
-            if volume is not None:
-                try:
-                    volume = int(volume)
-                    if volume > 1000:
-                        high_volume_keywords.append(kw)
-                except (ValueError, TypeError):
-                    continue
-        
-        low_competition_keywords = [kw for kw in outputs.search_keywords 
-                                  if kw.competition == "low"]
+        if df is None:
+            df = _outputs_to_df(outputs)
+        high_volume_count = int((df["volume"] > 1000).sum())
+        low_competition_count = int((df["competition"] == "low").sum())
         
-        if high_volume_keywords:
-            recommendations.append(f"Focus on {len(high_volume_keywords)} high-volume keywords for immediate impact")
+        if high_volume_count:
+            recommendations.append(f"Focus on {high_volume_count} high-volume keywords for immediate impact")
         
-        if low_competition_keywords:
-            recommendations.append(f"Target {len(low_competition_keywords)} low-competition keywords for cost efficiency")
+        if low_competition_count:
+            recommendations.append(f"Target {low_competition_count} low-competition keywords for cost efficiency")
         
         if len(outputs.pmax_themes) > 0:
             recommendations.append(f"Implement {len(outputs.pmax_themes)} PMax themes for broad reach")
@@ -416,6 +361,11 @@ def render_download_section(outputs: CampaignOutputs) -> None:
     
     st.subheader("📥 Export Results")
     
+    # One keyword table shared by every exporter. The exporters are cached on
+    # `outputs` (the leading underscore keeps `_df` out of the cache key), so
+    # widget reruns reuse the payloads instead of rebuilding them.
+    df = _outputs_to_df(outputs)
+    
     # File format selection
     col1, col2 = st.columns(2)
     
@@ -423,7 +373,7 @@ def render_download_section(outputs: CampaignOutputs) -> None:
         st.write("**📊 Individual Files**")
         
         # Search Keywords CSV
-        search_name, search_data = _create_search_keywords_csv(outputs)
+        search_name, search_data = _create_search_keywords_csv(outputs, df)
         st.download_button(
             "📋 Search Keywords (CSV)",
             data=search_data,
@@ -432,6 +382,17 @@ def render_download_section(outputs: CampaignOutputs) -> None:
             help="Complete search campaign keywords with ad groups and metrics"
         )
         
+        # Search Keywords Feather, for tooling that loads it straight into a DataFrame
+        if _HAS_PYARROW:
+            feather_name, feather_data = _create_search_keywords_feather(outputs, df)
+            st.download_button(
+                "📦 Search Keywords (Feather)",
+                data=feather_data,
+                file_name=feather_name,
+                mime="application/vnd.apache.arrow.file",
+                help="Same keyword table as the CSV, in a columnar format for pandas/Arrow"
+            )
+        
         # PMax Themes CSV
         pmax_name, pmax_data = _create_pmax_themes_csv(outputs)
         st.download_button(
@@ -443,7 +404,7 @@ def render_download_section(outputs: CampaignOutputs) -> None:
         )
         
         # Shopping CPC CSV
-        shopping_name, shopping_data = _create_shopping_cpc_csv(outputs)
+        shopping_name, shopping_data = _create_shopping_cpc_csv(outputs, df)
         st.download_button(
             "🛒 Shopping CPC (CSV)",
             data=shopping_data,
@@ -456,7 +417,7 @@ def render_download_section(outputs: CampaignOutputs) -> None:
         st.write("**📄 Comprehensive Reports**")
         
         # Campaign Summary JSON
-        summary_name, summary_data = _create_campaign_summary_json(outputs)
+        summary_name, summary_data = _create_campaign_summary_json(outputs, df)
         st.download_button(
             "📈 Campaign Summary (JSON)",
             data=summary_data,
@@ -465,9 +426,16 @@ def render_download_section(outputs: CampaignOutputs) -> None:
             help="Complete campaign analysis and recommendations"
         )
         
-        # Excel Report
-        try:
-            excel_name, excel_data = _create_excel_report(outputs)
+        # Excel Report: the workbook is the costliest export, so only build it
+        # once asked. The flag survives reruns until app.py stores a new result; the cache keeps the bytes.
+        if _HAS_OPENPYXL and st.button("📊 Prepare Excel Report", help="Build the multi-sheet Excel report"):
+            st.session_state.excel_requested = True
+        
+        if not _HAS_OPENPYXL:
+            st.info("💡 Install openpyxl for Excel export: `pip install openpyxl`")
+        elif st.session_state.get("excel_requested"):
+            with st.spinner("Building Excel report..."):
+                excel_name, excel_data = _create_excel_report(outputs, df)
             st.download_button(
                 "📊 Complete Report (Excel)",
                 data=excel_data,
@@ -475,8 +443,6 @@ def render_download_section(outputs: CampaignOutputs) -> None:
                 mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                 help="Comprehensive Excel report with multiple sheets"
             )
-        except ImportError:
-            st.info("💡 Install openpyxl for Excel export: `pip install openpyxl`")
     
     # Export options info
     with st.expander("💡 Export Options Guide", expanded=False):
@@ -487,6 +453,7 @@ def render_download_section(outputs: CampaignOutputs) -> None:
         - Search Keywords: Complete keyword list with ad groups and metrics
         - PMax Themes: Performance Max campaign themes and categories  
         - Shopping CPC: Shopping campaign recommendations and analysis
+        - Search Keywords (Feather): the keyword table for pandas/Arrow tooling (needs pyarrow)
         
         📄 **Comprehensive Reports**
         - JSON Summary: Complete campaign analysis with strategic insights
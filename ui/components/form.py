@@ -1,45 +1,78 @@
 from __future__ import annotations
 
-import yaml
+from functools import lru_cache
 from typing import Dict, List, Tuple, Optional
 
 import streamlit as st
 
 
+_ACCENT_CSS = """
+<style>
+:root {
+    --brand-1: #0f172a; /* slate-900 */
+    --brand-2: #1e293b; /* slate-800 */
+    --accent: #22c55e;  /* emerald-500 */
+}
+.stButton>button {
+    background: var(--accent) !important;
+    color: white !important;
+    border-radius: 8px !important;
+    padding: 0.6rem 1rem !important;
+    border: none !important;
+}
+.stTextInput>div>div>input, .stNumberInput>div>div>input, .stTextArea textarea {
+    border-radius: 8px !important;
+}
+.metric-card {
+    background-color: #f8fafc;
+    padding: 1rem;
+    border-radius: 8px;
+    border-left: 4px solid var(--accent);
+}
+</style>
+"""
+
+
 def _accent() -> None:
     """Apply custom styling to the UI."""
-    st.markdown(
-        """
-        <style>
-        :root {
-            --brand-1: #0f172a; /* slate-900 */
-            --brand-2: #1e293b; /* slate-800 */
-            --accent: #22c55e;  /* emerald-500 */
-        }
-        .stButton>button {
-            background: var(--accent) !important;
-            color: white !important;
-            border-radius: 8px !important;
-            padding: 0.6rem 1rem !important;
-            border: none !important;
-        }
-        .stTextInput>div>div>input, .stNumberInput>div>div>input, .stTextArea textarea {
-            border-radius: 8px !important;
-        }
-        .metric-card {
-            background-color: #f8fafc;
-            padding: 1rem;
-            border-radius: 8px;
-            border-left: 4px solid var(--accent);
-        }
-        </style>
-        """,
-        unsafe_allow_html=True,
-    )
+    st.markdown(_ACCENT_CSS, unsafe_allow_html=True)
+
+
+_EXAMPLE_CONFIG = {
+    "brand_url": "https://www.example.com",
+    "competitor_urls": [
+        "https://www.competitor1.com",
+        "https://www.competitor2.com"
+    ],
+    "service_locations": [
+        "United States",
+        "United Kingdom"
+    ],
+    "ad_budgets": {
+        "search_ads_budget": 5000,
+        "shopping_ads_budget": 3000,
+        "pmax_ads_budget": 7000
+    },
+    "project_settings": {
+        "assumed_conversion_rate": 0.02,
+        "min_search_volume_threshold": 500
+    }
+}
+
+
+@lru_cache(maxsize=1)
+def _example_config_yaml() -> str:
+    """YAML for the example config, dumped once rather than on every rerun."""
+    import yaml
+    
+    return yaml.dump(_EXAMPLE_CONFIG, default_flow_style=False)
 
 
 def render_config_upload() -> Optional[Dict]:
     """Render config file upload section."""
+    import yaml  # deferred: only the upload path parses or dumps YAML
+    from sem_plan.agents.config_agent import load_yaml
+    
     st.subheader("📁 Upload Configuration File")
     
     uploaded_file = st.file_uploader(
@@ -50,8 +83,8 @@ def render_config_upload() -> Optional[Dict]:
     
     if uploaded_file is not None:
         try:
-            yaml_content = uploaded_file.read().decode('utf-8')
-            config = yaml.safe_load(yaml_content)
+            # PyYAML detects the encoding (UTF-8/16, BOM) from the raw bytes itself
+            config = load_yaml(uploaded_file.read())
             
             if config:
                 st.success("✅ Configuration file loaded successfully!")
@@ -74,27 +107,7 @@ def render_config_upload() -> Optional[Dict]:
     
     # Show example config
     with st.expander("📝 Example Configuration", expanded=False):
-        example_config = {
-            "brand_url": "https://www.example.com",
-            "competitor_urls": [
-                "https://www.competitor1.com",
-                "https://www.competitor2.com"
-            ],
-            "service_locations": [
-                "United States",
-                "United Kingdom"
-            ],
-            "ad_budgets": {
-                "search_ads_budget": 5000,
-                "shopping_ads_budget": 3000,
-                "pmax_ads_budget": 7000
-            },
-            "project_settings": {
-                "assumed_conversion_rate": 0.02,
-                "min_search_volume_threshold": 500
-            }
-        }
-        st.code(yaml.dump(example_config, default_flow_style=False), language='yaml')
+        st.code(_example_config_yaml(), language='yaml')
     
     return None
 
@@ -125,7 +138,7 @@ def render_input_form() -> Tuple:
                 height=120,
                 help="List your main competitors' websites"
             )
-            competitor_urls = [x.strip() for x in competitors_text.splitlines() if x.strip()]
+            competitor_urls = [x for x in map(str.strip, competitors_text.splitlines()) if x]
             
             # Service Locations
             st.write("**Service Locations**")
@@ -135,7 +148,7 @@ def render_input_form() -> Tuple:
                 height=120,
                 help="List the geographic locations you want to target"
             )
-            service_locations = [x.strip() for x in locations_text.splitlines() if x.strip()]
+            service_locations = [x for x in map(str.strip, locations_text.splitlines()) if x]
         
         with col2:
             st.subheader("💰 Budget Configuration")
@@ -213,7 +226,7 @@ def render_input_form() -> Tuple:
                 height=80,
                 help="Additional seed keywords (comma separated)"
             )
-            extra_seeds = [s.strip() for s in extra_seeds_text.split(",") if s.strip()]
+            extra_seeds = [s for s in map(str.strip, extra_seeds_text.split(",")) if s]
             
             llm_context = st.text_area(
                 "LLM Context",
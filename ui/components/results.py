@@ -1,63 +1,93 @@
 from __future__ import annotations
 
-from typing import Dict, List
+from typing import TYPE_CHECKING, Dict, List
+import numpy as np
 import pandas as pd
 import streamlit as st
-import plotly.express as px
-import plotly.graph_objects as go
 from collections import Counter
 
 from sem_plan.core.types import CampaignOutputs, KeywordRecord
 
+from .downloads import _categorize_pmax_theme, _keyword_fields_frame
+
+# plotly is imported inside the figure builders: charts only render once results exist
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
+
+_CPC_MULTIPLIERS = {
+    "medium": (1.1, 1.6),
+    "high": (1.6, 2.2),
+}
+
 
 def _estimate_cpc_range(competition: str | None, baseline_cpc: float) -> tuple[float, float]:
     """Estimate CPC range based on competition level."""
-    low_mult, high_mult = (0.8, 1.1)
-    if competition == "medium":
-        low_mult, high_mult = (1.1, 1.6)
-    elif competition == "high":
-        low_mult, high_mult = (1.6, 2.2)
+    low_mult, high_mult = _CPC_MULTIPLIERS.get(competition, (0.8, 1.1))
     low = round(baseline_cpc * low_mult, 2)
     high = round(baseline_cpc * high_mult, 2)
     return low, high
 
 
+_CATEGORY_COLUMNS = ("Ad Group", "Match Type", "Intent", "Competition", "ROI Potential")
+
+@st.cache_data(show_spinner=False)
 def _create_search_dataframe(records: List[KeywordRecord], baseline_cpc: float) -> pd.DataFrame:
-    """Create comprehensive search keywords dataframe."""
-    data = []
-    for r in records:
-        # Get CPC values
-        cpc_low = r.gkp_top_of_page_bid_low if r.gkp_top_of_page_bid_low is not None else _estimate_cpc_range(r.competition, baseline_cpc)[0]
-        cpc_high = r.gkp_top_of_page_bid_high if r.gkp_top_of_page_bid_high is not None else _estimate_cpc_range(r.competition, baseline_cpc)[1]
-        
-        # Get search volume - ensure it's an integer
-        search_volume = r.gkp_avg_monthly_searches if getattr(r, "gkp_avg_monthly_searches", None) is not None else r.volume
-        # Convert to int, handling None and string values
-        if search_volume is not None:
-            try:
-                search_volume = int(search_volume)
-            except (ValueError, TypeError):
-                search_volume = 0
-        else:
-            search_volume = 0
-        
-        data.append({
-            "Ad Group": r.cluster,
-            "Keyword": r.keyword,
-            "Match Type": r.match_type,
-            "Intent": r.intent,
-            "Competition": r.competition or "medium",
-            "Avg Monthly Searches": search_volume,
-            "CPC Low ($)": cpc_low,
-            "CPC High ($)": cpc_high,
-            "CPC Range": f"${cpc_low:.2f} - ${cpc_high:.2f}",
-            "Sources": ", ".join(r.sources) if r.sources else "Unknown",
-            "Estimated Monthly Cost": search_volume * cpc_low if search_volume and cpc_low else 0,
-            "ROI Potential": _calculate_roi_potential(search_volume, cpc_low, r.intent)
-        })
-    
-    df = pd.DataFrame(data)
-    return df.sort_values(["Ad Group", "Avg Monthly Searches"], ascending=[True, False]) if not df.empty else df
+    """Create comprehensive search keywords dataframe.
+
+    Cached on the records' contents, so filter widget reruns reuse the table.
+    """
+    if not records:
+        return pd.DataFrame()
+    
+    # None stays None in this frame, which the fallbacks below key on
+    fields = _keyword_fields_frame(records)
+    competition = fields["competition"]
+    
+    # Estimated CPCs only depend on the competition level, so round once per level
+    estimates = {level: _estimate_cpc_range(level, baseline_cpc) for level in competition.unique()}
+    estimated = competition.map(estimates)
+    cpc_low = fields["gkp_top_of_page_bid_low"]
+    cpc_low = cpc_low.where(cpc_low.notna(), estimated.str[0]).astype(float)
+    cpc_high = fields["gkp_top_of_page_bid_high"]
+    cpc_high = cpc_high.where(cpc_high.notna(), estimated.str[1]).astype(float)
+    
+    # Search volume: GKP when present, else the heuristic volume; non-numeric counts as 0
+    gkp_volume = fields["gkp_avg_monthly_searches"]
+    search_volume = gkp_volume.where(gkp_volume.notna(), fields["volume"])
+    search_volume = pd.to_numeric(search_volume, errors="coerce").fillna(0).astype(np.int64)
+    
+    # KeywordRecord stores sources as a tuple, and only a handful of
+    # combinations occur, so join each distinct one once
+    source_labels = {sources: ", ".join(sources) if sources else "Unknown" for sources in set(fields["sources"])}
+    
+    intents = fields["intent"]
+    df = pd.DataFrame({
+        "Ad Group": fields["cluster"].tolist(),
+        "Keyword": fields["keyword"].tolist(),
+        "Match Type": fields["match_type"].tolist(),
+        "Intent": intents.tolist(),
+        "Competition": competition.where(competition.astype(bool), "medium").tolist(),
+        "Avg Monthly Searches": search_volume,
+        "CPC Low ($)": cpc_low,
+        "CPC High ($)": cpc_high,
+        "Sources": [source_labels[sources] for sources in fields["sources"]],
+        "Estimated Monthly Cost": (search_volume * cpc_low).where((search_volume != 0) & (cpc_low != 0), 0),
+        "ROI Potential": _calculate_roi_potential_vec(search_volume.to_numpy(), cpc_low.to_numpy(), intents.to_numpy()),
+    })
+    df = df.sort_values(["Ad Group", "Avg Monthly Searches"], ascending=[True, False])
+    
+    # Low-cardinality text columns become categoricals (after the sort, which
+    # stays alphabetical): filter masks and value counts then work on codes.
+    return df.astype({column: "category" for column in _CATEGORY_COLUMNS})
+
+
+_INTENT_MULTIPLIER = {
+    "transactional": 1.5,
+    "commercial": 1.2,
+    "informational": 0.8,
+    "navigational": 0.6
+}
 
 
 def _calculate_roi_potential(volume: int, cpc: float, intent: str) -> str:
@@ -70,12 +100,7 @@ def _calculate_roi_potential(volume: int, cpc: float, intent: str) -> str:
     cpc_efficiency = max(1 - (cpc / 5), 0)  # Lower CPC is better
     
     # Intent multiplier
-    intent_multiplier = {
-        "transactional": 1.5,
-        "commercial": 1.2,
-        "informational": 0.8,
-        "navigational": 0.6
-    }.get(intent, 1.0)
+    intent_multiplier = _INTENT_MULTIPLIER.get(intent, 1.0)
     
     total_score = (volume_score + cpc_efficiency) * intent_multiplier
     
@@ -87,9 +112,65 @@ def _calculate_roi_potential(volume: int, cpc: float, intent: str) -> str:
         return "📊 Low"
 
 
+def _calculate_roi_potential_vec(volumes: np.ndarray, cpcs: np.ndarray, intents: np.ndarray) -> np.ndarray:
+    """Column-wise `_calculate_roi_potential` for whole keyword arrays."""
+    volume_score = np.minimum(volumes / 1000, 5)
+    cpc_efficiency = np.maximum(1 - (cpcs / 5), 0)
+    intent_multiplier = np.select(
+        [intents == intent for intent in _INTENT_MULTIPLIER],
+        list(_INTENT_MULTIPLIER.values()),
+        default=1.0,
+    )
+    
+    total_score = (volume_score + cpc_efficiency) * intent_multiplier
+    
+    roi = np.select([total_score >= 4, total_score >= 2], ["🔥 High", "⚡ Medium"], default="📊 Low").astype(object)
+    roi[(volumes == 0) | (cpcs == 0)] = "Unknown"
+    return roi
+
+
+@st.cache_data(show_spinner=False)
+def _keyword_totals(records: List[KeywordRecord]) -> tuple[int, float]:
+    """Total search volume and estimated shopping spend, from one pass over the records."""
+    fields = pd.DataFrame(
+        ((r.gkp_avg_monthly_searches, r.volume, r.gkp_top_of_page_bid_low) for r in records),
+        columns=["gkp_volume", "volume", "cpc_low"],
+        dtype=object,
+    ).apply(pd.to_numeric, errors="coerce")  # None and non-numeric values become NaN
+    gkp_volume = fields["gkp_volume"]
+    
+    # GKP volume, else heuristic volume, else 0
+    total_volume = int(gkp_volume.mask(gkp_volume == 0).fillna(fields["volume"]).fillna(0).astype(np.int64).sum())
+    
+    # Shopping spend only counts keywords with a GKP volume, at $1 when the low bid is missing
+    priced = fields[gkp_volume.notna()]
+    cpc = priced["cpc_low"].mask(priced["cpc_low"] == 0).fillna(1.0)
+    total_budget = float((priced["gkp_volume"].astype(np.int64) * cpc).sum())
+    return total_volume, total_budget
+
+
+_SUMMARY_COLUMNS = (
+    "Ad Group", "Keyword", "Match Type", "Intent", "Competition",
+    "Avg Monthly Searches", "CPC Range", "ROI Potential",
+)
+_DETAIL_COLUMNS = (
+    "Ad Group", "Keyword", "Match Type", "Intent", "Competition", "Avg Monthly Searches",
+    "CPC Low ($)", "CPC High ($)", "CPC Range", "Sources", "Estimated Monthly Cost", "ROI Potential",
+)
+
+
+def _with_cpc_range(df: pd.DataFrame) -> pd.DataFrame:
+    """Add the display-only CPC range, formatted just for the rows being shown."""
+    return df.assign(**{"CPC Range": [
+        f"${low:.2f} - ${high:.2f}" for low, high in zip(df["CPC Low ($)"].tolist(), df["CPC High ($)"].tolist())
+    ]})
+
+
 def render_comprehensive_results(outputs: CampaignOutputs) -> None:
     """Render comprehensive results with detailed analysis."""
     
+    total_volume, total_budget = _keyword_totals(outputs.search_keywords)
+    
     # Overview metrics
     st.subheader("📊 Campaign Overview")
     col1, col2, col3, col4 = st.columns(4)
@@ -101,15 +182,6 @@ def render_comprehensive_results(outputs: CampaignOutputs) -> None:
     with col3:
         st.metric("Shopping Target CPC", f"${outputs.shopping_target_cpc:.2f}")
     with col4:
-        # Calculate total volume with proper type handling
-        total_volume = 0
-        for kw in outputs.search_keywords:
-            volume = kw.gkp_avg_monthly_searches or kw.volume or 0
-            if volume is not None:
-                try:
-                    total_volume += int(volume)
-                except (ValueError, TypeError):
-                    continue
         st.metric("Total Search Volume", f"{total_volume:,}")
     
     # Search Campaign Details
@@ -119,41 +191,50 @@ def render_comprehensive_results(outputs: CampaignOutputs) -> None:
     search_df = _create_search_dataframe(outputs.search_keywords, baseline_cpc)
     
     if not search_df.empty:
-        # Filters
+        # Filters; the cached table's categories are already the sorted distinct values
         col1, col2, col3 = st.columns(3)
         with col1:
-            ad_groups = ["All"] + sorted(search_df["Ad Group"].unique().tolist())
+            ad_groups = ["All"] + search_df["Ad Group"].cat.categories.tolist()
             selected_ad_group = st.selectbox("Filter by Ad Group", ad_groups)
         
         with col2:
-            intents = ["All"] + sorted(search_df["Intent"].unique().tolist())
+            intents = ["All"] + search_df["Intent"].cat.categories.tolist()
             selected_intent = st.selectbox("Filter by Intent", intents)
         
         with col3:
-            competitions = ["All"] + sorted(search_df["Competition"].unique().tolist())
+            competitions = ["All"] + search_df["Competition"].cat.categories.tolist()
             selected_competition = st.selectbox("Filter by Competition", competitions)
         
-        # Apply filters
-        filtered_df = search_df.copy()
-        if selected_ad_group != "All":
-            filtered_df = filtered_df[filtered_df["Ad Group"] == selected_ad_group]
-        if selected_intent != "All":
-            filtered_df = filtered_df[filtered_df["Intent"] == selected_intent]
-        if selected_competition != "All":
-            filtered_df = filtered_df[filtered_df["Competition"] == selected_competition]
+        # Apply filters as one combined mask, indexing the table once; with
+        # every filter on "All" the cached table is used as-is
+        filtered_df = search_df
+        active = [
+            (column, selected)
+            for column, selected in (
+                ("Ad Group", selected_ad_group),
+                ("Intent", selected_intent),
+                ("Competition", selected_competition),
+            )
+            if selected != "All"
+        ]
+        if active:
+            mask = np.ones(len(search_df), dtype=bool)
+            for column, selected in active:
+                # Compare integer category codes; no intermediate boolean Series
+                categorical = search_df[column].cat
+                mask &= categorical.codes.to_numpy() == categorical.categories.get_loc(selected)
+            filtered_df = search_df[mask]
         
-        # Display filtered results
+        # Display filtered results: one table, serialized once; the toggle only
+        # changes which columns the browser shows
+        show_details = st.toggle("📋 Show detailed keyword data", value=False)
         st.dataframe(
-            filtered_df[["Ad Group", "Keyword", "Match Type", "Intent", "Competition", 
-                        "Avg Monthly Searches", "CPC Range", "ROI Potential"]],
+            _with_cpc_range(filtered_df),
+            column_order=_DETAIL_COLUMNS if show_details else _SUMMARY_COLUMNS,
             use_container_width=True,
             height=400
         )
         
-        # Detailed view in expandable section
-        with st.expander("📋 Detailed Keyword Data", expanded=False):
-            st.dataframe(filtered_df, use_container_width=True)
-        
         # Analytics
         _render_search_analytics(filtered_df)
     
@@ -186,17 +267,6 @@ def render_comprehensive_results(outputs: CampaignOutputs) -> None:
         st.caption("Based on budget and conversion rate")
     
     with col2:
-        # Calculate shopping metrics
-        total_budget = 0
-        for kw in outputs.search_keywords:
-            volume = kw.gkp_avg_monthly_searches
-            if volume is not None:
-                try:
-                    volume = int(volume)
-                    cpc = kw.gkp_top_of_page_bid_low or 1.0
-                    total_budget += volume * cpc
-                except (ValueError, TypeError):
-                    continue
         st.metric("Estimated Monthly Spend", f"${total_budget:.0f}")
     
     # Shopping recommendations
@@ -208,8 +278,58 @@ def render_comprehensive_results(outputs: CampaignOutputs) -> None:
         st.write("• Focus on high-converting product categories")
 
 
+_MAX_SCATTER_POINTS = 2000
+
+
+@st.cache_data(show_spinner=False)
+def _build_count_pie(names: tuple, counts: tuple, title: str) -> go.Figure:
+    import plotly.express as px
+    
+    return px.pie(values=list(counts), names=list(names), title=title)
+
+
+@st.cache_data(show_spinner=False)
+def _build_intent_bar(names: tuple, counts: tuple) -> go.Figure:
+    import plotly.express as px
+    
+    return px.bar(
+        x=list(names),
+        y=list(counts),
+        title="Keywords by Intent",
+        labels={"x": "Intent", "y": "Count"}
+    )
+
+
+@st.cache_data(show_spinner=False)
+def _build_volume_cpc_scatter(df: pd.DataFrame, title: str) -> go.Figure:
+    import plotly.express as px
+    
+    return px.scatter(
+        df,
+        x="Avg Monthly Searches",
+        y="CPC Low ($)",
+        color="Intent",
+        size="Avg Monthly Searches",
+        hover_data=["Keyword", "Ad Group"],
+        title=title
+    )
+
+
+def _value_counts(column: pd.Series) -> tuple[tuple, tuple]:
+    """(values, counts) of a categorical column, most common first, as hashable cache keys."""
+    codes = column.cat.codes.to_numpy()
+    counts = np.bincount(codes[codes >= 0], minlength=len(column.cat.categories))
+    order = np.argsort(-counts, kind="stable")
+    order = order[counts[order] > 0]  # skip levels a filtered slice no longer contains
+    return tuple(column.cat.categories[order]), tuple(counts[order].tolist())
+
+
 def _render_search_analytics(df: pd.DataFrame) -> None:
-    """Render search campaign analytics."""
+    """Render search campaign analytics.
+
+    Figures are cached on the counts (or the plotted columns), so reruns with
+    an unchanged filter selection reuse them.
+    """
     st.subheader("📈 Search Campaign Analytics")
     
     col1, col2 = st.columns(2)
@@ -217,24 +337,13 @@ def _render_search_analytics(df: pd.DataFrame) -> None:
     with col1:
         # Ad Group Distribution
         if not df.empty:
-            ad_group_counts = df["Ad Group"].value_counts()
-            fig = px.pie(
-                values=ad_group_counts.values,
-                names=ad_group_counts.index,
-                title="Keywords by Ad Group"
-            )
+            fig = _build_count_pie(*_value_counts(df["Ad Group"]), "Keywords by Ad Group")
             st.plotly_chart(fig, use_container_width=True, key="ad_group_pie")
     
     with col2:
         # Intent Distribution
         if not df.empty:
-            intent_counts = df["Intent"].value_counts()
-            fig = px.bar(
-                x=intent_counts.index,
-                y=intent_counts.values,
-                title="Keywords by Intent",
-                labels={"x": "Intent", "y": "Count"}
-            )
+            fig = _build_intent_bar(*_value_counts(df["Intent"]))
             st.plotly_chart(fig, use_container_width=True, key="intent_bar")
     
     # Competition Analysis
@@ -242,45 +351,22 @@ def _render_search_analytics(df: pd.DataFrame) -> None:
     
     with col1:
         if not df.empty:
-            competition_counts = df["Competition"].value_counts()
-            fig = px.pie(
-                values=competition_counts.values,
-                names=competition_counts.index,
-                title="Keywords by Competition Level"
-            )
+            fig = _build_count_pie(*_value_counts(df["Competition"]), "Keywords by Competition Level")
             st.plotly_chart(fig, use_container_width=True, key="competition_pie")
     
     with col2:
         # Volume vs CPC Scatter
         if not df.empty and "Avg Monthly Searches" in df.columns and "CPC Low ($)" in df.columns:
-            fig = px.scatter(
-                df,
-                x="Avg Monthly Searches",
-                y="CPC Low ($)",
-                color="Intent",
-                size="Avg Monthly Searches",
-                hover_data=["Keyword", "Ad Group"],
-                title="Search Volume vs CPC"
-            )
+            plot_df = df[["Avg Monthly Searches", "CPC Low ($)", "Intent", "Keyword", "Ad Group"]]
+            title = "Search Volume vs CPC"
+            if len(plot_df) > _MAX_SCATTER_POINTS:
+                # Bound the payload sent to the browser; a fixed seed keeps the sample stable across reruns
+                plot_df = plot_df.sample(_MAX_SCATTER_POINTS, random_state=0)
+                title += f" (sample of {_MAX_SCATTER_POINTS:,} keywords)"
+            fig = _build_volume_cpc_scatter(plot_df, title)
             st.plotly_chart(fig, use_container_width=True, key="volume_cpc_scatter")
 
 
-def _categorize_pmax_theme(theme: str) -> str:
-    """Categorize PMax theme based on content."""
-    theme_lower = theme.lower()
-    
-    if any(word in theme_lower for word in ["product", "service", "solution"]):
-        return "Product Category"
-    elif any(word in theme_lower for word in ["use", "case", "scenario", "workflow"]):
-        return "Use Case"
-    elif any(word in theme_lower for word in ["professional", "business", "enterprise", "team"]):
-        return "Demographic"
-    elif any(word in theme_lower for word in ["seasonal", "event", "time", "period"]):
-        return "Seasonal/Event"
-    else:
-        return "General"
-
-
 def render_results(outputs: CampaignOutputs) -> None:
     """Legacy function for backward compatibility."""
     render_comprehensive_results(outputs)